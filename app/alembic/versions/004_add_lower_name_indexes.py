@@ -0,0 +1,35 @@
+"""Add lower(name) indexes for case-insensitive name lookups
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-08-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+LOWER_NAME_INDEXES = {
+    'ix_patients_name_lower': 'patients',
+    'ix_providers_name_lower': 'providers',
+    'ix_panels_name_lower': 'panels',
+}
+
+
+def upgrade():
+    """Create expression indexes on lower(name) used by import conflict checks."""
+    # IF NOT EXISTS keeps this safe for databases whose tables were created from the models
+    for index_name, table_name in LOWER_NAME_INDEXES.items():
+        op.execute(sa.text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} (lower(name))"))
+
+
+def downgrade():
+    """Drop the lower(name) expression indexes."""
+    for index_name in LOWER_NAME_INDEXES:
+        op.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
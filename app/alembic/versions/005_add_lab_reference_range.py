@@ -0,0 +1,51 @@
+"""Store each lab's formatted reference range
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-08-22 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def _format_reference_range(ref_type, ref_low, ref_high, ref_value):
+    """Mirror models.format_reference_range as of this revision."""
+    if ref_type == "greater" and ref_value is not None:
+        return f"> {ref_value}"
+    elif ref_type == "less" and ref_value is not None:
+        return f"< {ref_value}"
+    elif (ref_type == "range" or ref_type is None) and ref_low is not None and ref_high is not None:
+        return f"{ref_low} - {ref_high}"
+    else:
+        return None
+
+
+def upgrade():
+    """Add labs.reference_range and backfill it from the existing ref_* columns."""
+    conn = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(conn).get_columns('labs')}
+    # Databases created from the models already have the column
+    if 'reference_range' not in columns:
+        op.add_column('labs', sa.Column('reference_range', sa.String(length=64), nullable=True))
+
+    labs = conn.execute(sa.text("SELECT id, ref_type, ref_low, ref_high, ref_value FROM labs")).fetchall()
+    updates = [
+        {"id": lab_id, "reference_range": _format_reference_range(ref_type, ref_low, ref_high, ref_value)}
+        for lab_id, ref_type, ref_low, ref_high, ref_value in labs
+    ]
+    if updates:
+        conn.execute(sa.text("UPDATE labs SET reference_range = :reference_range WHERE id = :id"), updates)
+
+
+def downgrade():
+    """Drop labs.reference_range."""
+    with op.batch_alter_table('labs') as batch_op:
+        batch_op.drop_column('reference_range')
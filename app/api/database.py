@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
 # Auto-configure database URL with fallback to local SQLite
@@ -18,8 +18,52 @@ engine = create_engine(
     echo=False
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Use WAL with relaxed syncing so writes batch fsyncs and readers don't block writers."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+        cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Bumped after every committed write; caches derived from the data compare it to detect changes
+_data_generation = 0
+
+
+def data_generation() -> int:
+    """Return the current data generation."""
+    return _data_generation
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["data_written"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["data_written"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _bump_data_generation(session):
+    global _data_generation
+    if session.info.pop("data_written", False):
+        _data_generation += 1
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_write_mark(session):
+    session.info.pop("data_written", None)
+
 
 def get_db():
     """FastAPI dependency to provide database sessions with automatic cleanup."""
@@ -102,6 +146,11 @@ def init_essential_data():
     # Fallback to creating tables if migrations didn't run
     Base.metadata.create_all(bind=engine)
 
+    # Refresh query planner statistics once per startup
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA optimize"))
+
     db = SessionLocal()
     try:
         if db.query(Patient).count() > 0:
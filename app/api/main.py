@@ -1,6 +1,8 @@
 """MyLabVault API"""
 
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -30,8 +32,13 @@ app = FastAPI(
 	redoc_url="/api/redoc"
 )
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; handlers only enqueue records, and a listener thread writes them out
+_log_queue = queue.SimpleQueue()
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _log_stream_handler)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 # Add validation error handler for better debugging
@@ -88,6 +95,11 @@ async def startup_event():
     else:
         print("⚠️  Database imports failed, running without database functionality")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued log records before the process exits."""
+    _log_listener.stop()
+
 # Page routes
 app.include_router(pages.router, tags=["pages"])
 
@@ -3,18 +3,90 @@
 import json
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
-from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Text, func, or_, and_
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey, Index, Text, event, func, or_, and_
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Session
 
+from .utils.cache import api_cache
+
 Base = declarative_base()
 
+def format_reference_range(
+    ref_type: Optional[str], ref_low: Optional[float], ref_high: Optional[float], ref_value: Optional[float]
+) -> Optional[str]:
+    """Format a lab's reference range for display, or None when it is incomplete."""
+    if ref_type == "greater" and ref_value is not None:
+        return f"> {ref_value}"
+    elif ref_type == "less" and ref_value is not None:
+        return f"< {ref_value}"
+    elif (ref_type == "range" or ref_type is None) and ref_low is not None and ref_high is not None:
+        return f"{ref_low} - {ref_high}"
+    else:
+        return None
+
+def result_is_normal(
+    ref_type: Optional[str], ref_low: Optional[float], ref_high: Optional[float], ref_value: Optional[float],
+    result: Optional[float]
+) -> bool:
+    """Check if a result value is within a lab's reference range."""
+    if result is None:
+        return True
+    try:
+        # Handle different reference range types
+        if ref_type == "greater" and ref_value is not None:
+            return result > ref_value
+        elif ref_type == "less" and ref_value is not None:
+            return result < ref_value
+        elif ref_type == "range" or ref_type is None:
+            # Traditional range-based check
+            ref_low = float(ref_low) if ref_low is not None else None
+            ref_high = float(ref_high) if ref_high is not None else None
+            if ref_low is None or ref_high is None:
+                return True
+            return ref_low <= result <= ref_high
+        else:
+            return True
+    except (ValueError, TypeError):
+        return True
+
+def result_status(
+    ref_type: Optional[str], ref_low: Optional[float], ref_high: Optional[float], ref_value: Optional[float],
+    result: float
+) -> str:
+    """Get status of a result value against a lab's reference range (normal, high, low)."""
+    try:
+        # Handle different reference range types
+        if ref_type == "greater" and ref_value is not None:
+            if result > ref_value:
+                return "normal"
+            else:
+                return "low"
+        elif ref_type == "less" and ref_value is not None:
+            if result < ref_value:
+                return "normal"
+            else:
+                return "high"
+        elif ref_type == "range" or ref_type is None:
+            # Traditional range-based check
+            if ref_low is None or ref_high is None:
+                return "unknown"
+            if result < ref_low:
+                return "low"
+            if result > ref_high:
+                return "high"
+            return "normal"
+        else:
+            return "unknown"
+    except (ValueError, TypeError):
+        return "unknown"
+
 class Panel(Base):
     """Lab test panel model."""
     __tablename__ = "panels"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    __table_args__ = (Index("ix_panels_name_lower", func.lower(name)),)
 
     labs = relationship("Lab", back_populates="panel")
 
@@ -49,6 +121,7 @@ class Patient(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    __table_args__ = (Index("ix_patients_name_lower", func.lower(name)),)
     date_of_birth = Column(Date, nullable=True)
     gender = Column(String(10), nullable=True)
 
@@ -96,6 +169,7 @@ class Provider(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
+    __table_args__ = (Index("ix_providers_name_lower", func.lower(name)),)
     specialty = Column(String(255), nullable=True)
 
     results = relationship("LabResult", back_populates="provider")
@@ -119,6 +193,21 @@ class Provider(Base):
                 patients.append(result.patient)
         return patients
 
+    @property
+    def result_count(self) -> int:
+        """Total count of results for this provider."""
+        return self.get_result_count()
+
+    @property
+    def patient_count(self) -> int:
+        """Count of unique patients for this provider."""
+        return len(self.get_patients())
+
+    @property
+    def recent_results_count(self) -> int:
+        """Count of results from the last 30 days."""
+        return len(self.get_recent_results())
+
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert provider to dictionary."""
@@ -145,13 +234,13 @@ class Unit(Base):
         return len(self.labs)
 
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert unit to dictionary."""
+    def to_dict(self, lab_count: Optional[int] = None) -> Dict[str, Any]:
+        """Convert unit to dictionary, using a precomputed lab_count when given."""
         return {
             "id": self.id,
             "name": self.name,
             "symbol": self.name,  # Use name as symbol since there's no separate symbol column
-            "lab_count": self.get_lab_count()
+            "lab_count": self.get_lab_count() if lab_count is None else lab_count
         }
 
 class Lab(Base):
@@ -166,6 +255,7 @@ class Lab(Base):
     ref_high = Column(Float, nullable=True)
     ref_type = Column(String(10), nullable=True, default="range")  # 'range', 'greater', 'less'
     ref_value = Column(Float, nullable=True)  # Single value for greater/less than
+    reference_range = Column(String(64), nullable=True)  # Display text, kept in sync on every flush
 
     panel = relationship("Panel", back_populates="labs")
     unit = relationship("Unit", back_populates="labs")
@@ -173,53 +263,11 @@ class Lab(Base):
 
     def is_result_normal(self, value: float) -> bool:
         """Check if a result value is within normal range."""
-        if value is None:
-            return True
-        try:
-            # Handle different reference range types
-            if self.ref_type == "greater" and self.ref_value is not None:
-                return value > self.ref_value
-            elif self.ref_type == "less" and self.ref_value is not None:
-                return value < self.ref_value
-            elif self.ref_type == "range" or self.ref_type is None:
-                # Traditional range-based check
-                ref_low = float(self.ref_low) if self.ref_low is not None else None
-                ref_high = float(self.ref_high) if self.ref_high is not None else None
-                if ref_low is None or ref_high is None:
-                    return True
-                return ref_low <= value <= ref_high
-            else:
-                return True
-        except (ValueError, TypeError):
-            return True
+        return result_is_normal(self.ref_type, self.ref_low, self.ref_high, self.ref_value, value)
 
     def get_result_status(self, value: float) -> str:
         """Get status of a result value (normal, high, low)."""
-        try:
-            # Handle different reference range types
-            if self.ref_type == "greater" and self.ref_value is not None:
-                if value > self.ref_value:
-                    return "normal"
-                else:
-                    return "low"
-            elif self.ref_type == "less" and self.ref_value is not None:
-                if value < self.ref_value:
-                    return "normal"
-                else:
-                    return "high"
-            elif self.ref_type == "range" or self.ref_type is None:
-                # Traditional range-based check
-                if self.ref_low is None or self.ref_high is None:
-                    return "unknown"
-                if value < self.ref_low:
-                    return "low"
-                if value > self.ref_high:
-                    return "high"
-                return "normal"
-            else:
-                return "unknown"
-        except (ValueError, TypeError):
-            return "unknown"
+        return result_status(self.ref_type, self.ref_low, self.ref_high, self.ref_value, value)
 
 
     def get_result_count(self) -> int:
@@ -249,6 +297,12 @@ class Lab(Base):
             "abnormal_results_count": self.get_abnormal_results_count()
         }
 
+@event.listens_for(Lab, "before_insert")
+@event.listens_for(Lab, "before_update")
+def _sync_reference_range(mapper, connection, lab: Lab):
+    """Store the formatted reference range whenever a lab is written through the ORM."""
+    lab.reference_range = format_reference_range(lab.ref_type, lab.ref_low, lab.ref_high, lab.ref_value)
+
 class LabResult(Base):
     """Lab result model."""
     __tablename__ = "lab_results"
@@ -293,20 +347,8 @@ class LabResult(Base):
 
     @property
     def reference_range(self) -> Optional[str]:
-        """Get the reference range for this result."""
-        if not self.lab:
-            return None
-
-        # Handle different reference range types
-        if self.lab.ref_type == "greater" and self.lab.ref_value is not None:
-            return f"> {self.lab.ref_value}"
-        elif self.lab.ref_type == "less" and self.lab.ref_value is not None:
-            return f"< {self.lab.ref_value}"
-        elif (self.lab.ref_type == "range" or self.lab.ref_type is None) and \
-             self.lab.ref_low is not None and self.lab.ref_high is not None:
-            return f"{self.lab.ref_low} - {self.lab.ref_high}"
-        else:
-            return None
+        """Get the reference range for this result, as stored on its lab."""
+        return self.lab.reference_range if self.lab else None
 
     def get_reference_range(self) -> Optional[str]:
         """Get the reference range for this result (backward compatibility)."""
@@ -356,6 +398,11 @@ class PDFImportLog(Base):
 
     provider = relationship("Provider")
 
+    @property
+    def provider_name(self) -> Optional[str]:
+        """Get selected provider name via relationship."""
+        return self.provider.name if self.provider else None
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert import log to dictionary."""
         return {
@@ -367,7 +414,7 @@ class PDFImportLog(Base):
             "tests_imported": self.tests_imported,
             "tests_skipped": self.tests_skipped,
             "date_collected": self.date_collected,
-            "provider_name": self.provider.name if self.provider else None,
+            "provider_name": self.provider_name,
             "provider_id": self.provider_id,
             "status": self.status,
             "error_message": self.error_message,
@@ -416,6 +463,9 @@ class UserSettings(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    CACHE_KEY = "user_settings"
+    CACHE_TTL = 30  # Seconds; bounds staleness if another process writes settings
+
     @classmethod
     def get_settings(cls, db: Session, user_id: int = 1) -> 'UserSettings':
         """
@@ -475,6 +525,26 @@ class UserSettings(Base):
         settings.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(settings)
+        api_cache.invalidate_tag(cls.CACHE_KEY)
+        return settings
+
+    @classmethod
+    def get_settings_dict(cls, db: Session, user_id: int = 1) -> Dict[str, Any]:
+        """
+        Get user settings as a dictionary, served from the in-process cache when warm.
+        
+        Args:
+            db: Database session
+            user_id: User ID (default: 1 for single user)
+            
+        Returns:
+            Dict[str, Any]: Settings dictionary (shared; do not mutate)
+        """
+        cache_key = f"{cls.CACHE_KEY}:{user_id}"
+        settings = api_cache.get(cache_key)
+        if settings is None:
+            settings = cls.get_settings(db, user_id).to_dict()
+            api_cache.set(cache_key, settings, ttl=cls.CACHE_TTL, tags=(cls.CACHE_KEY,))
         return settings
 
     def to_dict(self) -> Dict[str, Any]:
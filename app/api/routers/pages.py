@@ -74,12 +74,12 @@ def get_selected_patient_id(request: Request) -> int:
 
 def _render_simple_page(template_name: str, request: Request, db: Session):
     """Render a simple page with standard context."""
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
     return templates.TemplateResponse(
         template_name,
         {
             "request": request,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
@@ -100,7 +100,7 @@ def index_page(request: Request, db: Session = Depends(get_db)):
 def dashboard_page(request: Request, db: Session = Depends(get_db)):
     """Dashboard page with server-side rendering."""
     # Get user settings
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
 
     # Get selected patient from cookie
     patient_id = get_selected_patient_id(request)
@@ -148,7 +148,7 @@ def dashboard_page(request: Request, db: Session = Depends(get_db)):
         {
             "request": request, 
             "dashboard_data": dashboard_data,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
@@ -157,7 +157,7 @@ def dashboard_page(request: Request, db: Session = Depends(get_db)):
 def results_page(request: Request, db: Session = Depends(get_db)):
     """Results page with server-side rendering and DataTables."""
     # Get user settings
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
 
     # Get selected patient from cookie
     patient_id = get_selected_patient_id(request)
@@ -188,7 +188,7 @@ def results_page(request: Request, db: Session = Depends(get_db)):
         {
             "request": request,
             "results": results,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
@@ -197,7 +197,7 @@ def results_page(request: Request, db: Session = Depends(get_db)):
 def lab_detail_page(request: Request, lab_id: int, db: Session = Depends(get_db)):
     """Individual lab detail page with results history and chart."""
     # Get user settings
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
 
     # Get selected patient from cookie
     patient_id = get_selected_patient_id(request)
@@ -221,7 +221,7 @@ def lab_detail_page(request: Request, lab_id: int, db: Session = Depends(get_db)
                 "request": request,
                 "lab_info": None,
                 "lab_results": [],
-                "user_settings": user_settings.to_dict(),
+                "user_settings": user_settings,
                 "pending_imports_count": get_pending_imports_count(db)
             }
         )
@@ -249,7 +249,7 @@ def lab_detail_page(request: Request, lab_id: int, db: Session = Depends(get_db)
             "request": request,
             "lab_info": lab_info,
             "lab_results": lab_results,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
@@ -258,7 +258,7 @@ def lab_detail_page(request: Request, lab_id: int, db: Session = Depends(get_db)
 def charts_page(request: Request, db: Session = Depends(get_db)):
     """Charts page with panel and individual lab dropdowns."""
     # Get user settings
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
 
     # Get selected patient from cookie
     patient_id = get_selected_patient_id(request)
@@ -336,7 +336,7 @@ def charts_page(request: Request, db: Session = Depends(get_db)):
             "request": request,
             "panels": panels_data,
             "grouped_labs": grouped_labs,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
@@ -385,7 +385,7 @@ def bulk_import_page(request: Request, db: Session = Depends(get_db)):
 def result_detail_page(request: Request, result_id: int, db: Session = Depends(get_db)):
     """Individual result detail page for editing."""
     # Get user settings
-    user_settings = UserSettingsModel.get_settings(db)
+    user_settings = UserSettingsModel.get_settings_dict(db)
 
     # Get the specific result with all relationships
     result = (
@@ -407,7 +407,7 @@ def result_detail_page(request: Request, result_id: int, db: Session = Depends(g
             {
                 "request": request,
                 "result": None,
-                "user_settings": user_settings.to_dict(),
+                "user_settings": user_settings,
                 "pending_imports_count": get_pending_imports_count(db)
             }
         )
@@ -417,7 +417,7 @@ def result_detail_page(request: Request, result_id: int, db: Session = Depends(g
         {
             "request": request,
             "result": result,
-            "user_settings": user_settings.to_dict(),
+            "user_settings": user_settings,
             "pending_imports_count": get_pending_imports_count(db)
         }
     )
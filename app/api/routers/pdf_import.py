@@ -1,21 +1,25 @@
 """PDF import and processing routes."""
 
 import hashlib
-import json
 import os
 import re
+from email.utils import formatdate
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Form, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from sqlalchemy import update
 from sqlalchemy.orm import Session, joinedload
+import orjson
 import pypdf
 from werkzeug.utils import secure_filename
 from ..database import get_db
 from ..models import PDFImportLog, LabResult, Lab, Provider, Patient, Panel, Unit, ImportTemplate
-from ..schemas import APIResponse, PDFImportPreview, PDFImportConfirm
+from ..schemas import (
+    APIResponse, PDFBatchImportCounts, PDFImportConfirm, PDFImportCounts, PDFImportPreview, PDFImportRead
+)
 from ..services.pdf_parser import PDFParser
 import logging
 
@@ -84,7 +88,6 @@ async def upload_pdf(
         parsed_data = await parser.parse_pdf_content(content)
 
         # Create import log with cached parsed data
-        import json
         import_log = PDFImportLog(
             filename=file.filename,
             file_hash=file_hash,
@@ -92,7 +95,7 @@ async def upload_pdf(
             total_tests_found=len(parsed_data.get('tests', [])),
             date_collected=parsed_data.get('date_collected'),
             status="pending",
-            parsed_data=json.dumps(parsed_data)  # Cache parsed data as JSON
+            parsed_data=orjson.dumps(parsed_data).decode()  # Cache parsed data as JSON
         )
         db.add(import_log)
         db.commit()
@@ -383,8 +386,8 @@ async def confirm_batch_import(
             # Use existing confirmation logic
             result = await confirm_pdf_import(request, merged_confirmation, db)
             if result.success:
-                total_imported += result.data.get("imported_count", 0)
-                total_skipped += result.data.get("skipped_count", 0)
+                total_imported += result.data.imported_count
+                total_skipped += result.data.skipped_count
             
         except Exception as e:
             import_log = db.query(PDFImportLog).filter_by(id=confirmation.get("import_id")).first()
@@ -397,13 +400,13 @@ async def confirm_batch_import(
         success=len(failed_imports) == 0,
         message=f"Batch import completed: {total_imported} tests imported, {total_skipped} skipped" + 
                (f", {len(failed_imports)} files failed" if failed_imports else ""),
-        data={
-            "batch_id": batch_id,
-            "total_imported": total_imported,
-            "total_skipped": total_skipped,
-            "failed_count": len(failed_imports),
-            "failed_files": failed_imports
-        }
+        data=PDFBatchImportCounts(
+            batch_id=str(batch_id),
+            total_imported=total_imported,
+            total_skipped=total_skipped,
+            failed_count=len(failed_imports),
+            failed_files=failed_imports
+        )
     )
 
 @router.delete("/cancel/{import_id}")
@@ -476,10 +479,9 @@ async def confirm_pdf_import(
             raise HTTPException(status_code=404, detail="Import not found")
 
         # Use cached parsed data instead of re-parsing PDF
-        import json
         if import_log.parsed_data:
             # Use cached parsed data
-            parsed_data = json.loads(import_log.parsed_data)
+            parsed_data = orjson.loads(import_log.parsed_data)
         else:
             # Fallback: re-parse if cached data not available (backward compatibility)
             file_path = Path(import_log.file_path)
@@ -688,10 +690,10 @@ async def confirm_pdf_import(
         return APIResponse(
             success=True,
             message=f"Successfully imported {imported_count} test results",
-            data={
-                "imported_count": imported_count,
-                "skipped_count": skipped_count
-            }
+            data=PDFImportCounts(
+                imported_count=imported_count,
+                skipped_count=skipped_count
+            )
         )
 
     except Exception as e:
@@ -762,17 +764,23 @@ def validate_file_path(file_path: Path, allowed_dir: Path) -> Path:
 
 
 @router.get("/file/{filename}")
-async def get_pdf_file(filename: str, download: bool = False, db: Session = Depends(get_db)):
+async def get_pdf_file(
+    filename: str,
+    request: Request,
+    download: bool = False,
+    db: Session = Depends(get_db)
+):
     """
     Serve PDF file for viewing in frontend or force download.
 
     Args:
         filename: Name of the PDF file to serve
+        request: Incoming request, used for conditional (If-None-Match) handling
         download: If True, force download; if False, display inline
         db: Database session dependency
 
     Returns:
-        FileResponse: PDF file with appropriate headers
+        FileResponse: PDF file with appropriate headers, or 304 if the client copy is current
 
     Raises:
         HTTPException: 404 if file not found, 400/403 for security violations
@@ -784,44 +792,47 @@ async def get_pdf_file(filename: str, download: bool = False, db: Session = Depe
         - Works with Docker container path differences
         - Sets proper MIME type and disposition for PDF viewing or downloading
         - Supports both inline PDF viewing and forced downloads
+        - Sends ETag/Last-Modified so repeat loads can be answered with 304
     """
     # Validate and sanitize the filename
     safe_filename = validate_filename(filename)
 
-    # First try to find the file directly
-    file_path = UPLOADS_DIR / safe_filename
-
-    # Validate the file path is within allowed directory
-    file_path = validate_file_path(file_path, UPLOADS_DIR)
-
-    if not file_path.exists():
-        # If not found, look up the actual file path from the database
-        import_log = db.query(PDFImportLog).filter(PDFImportLog.filename == safe_filename).first()
-        if import_log and import_log.file_path:
-            # Convert relative path to absolute path (handles Docker working directory differences)
-            actual_file_path = Path("/app") / import_log.file_path
-
-            # Validate the database file path is also within allowed directories
-            app_data_dir = Path("/app/data")
-            actual_file_path = validate_file_path(actual_file_path, app_data_dir)
-
-            if actual_file_path.exists():
-                disposition = "attachment" if download else "inline"
-                return FileResponse(
-                    path=str(actual_file_path),
-                    media_type='application/pdf',
-                    filename=safe_filename,
-                    headers={"Content-Disposition": f'{disposition}; filename="{safe_filename}"'}
-                )
+    # Prefer the path recorded at import time, falling back to the uploads directory
+    import_log = db.query(PDFImportLog.file_path).filter(PDFImportLog.filename == safe_filename).first()
+    if import_log and import_log.file_path:
+        # Convert relative path to absolute path (handles Docker working directory differences)
+        file_path = validate_file_path(Path("/app") / import_log.file_path, Path("/app/data"))
+    else:
+        file_path = validate_file_path(UPLOADS_DIR / safe_filename, UPLOADS_DIR)
 
-        raise HTTPException(status_code=404, detail="PDF file not found")
+    # Stat once and hand the result to FileResponse so it does not stat again
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
+        if not (import_log and import_log.file_path):
+            raise HTTPException(status_code=404, detail="PDF file not found")
+        # The recorded path may be stale (e.g. after a data import or a moved /app root)
+        file_path = validate_file_path(UPLOADS_DIR / safe_filename, UPLOADS_DIR)
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="PDF file not found")
+
+    etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
     disposition = "attachment" if download else "inline"
     return FileResponse(
         path=str(file_path),
+        stat_result=stat_result,
         media_type='application/pdf',
         filename=safe_filename,
-        headers={"Content-Disposition": f'{disposition}; filename="{safe_filename}"'}
+        headers={
+            "Content-Disposition": f'{disposition}; filename="{safe_filename}"',
+            "ETag": etag,
+            "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True)
+        }
     )
 
 
@@ -860,19 +871,20 @@ async def get_import_details(import_id: int, db: Session = Depends(get_db)):
         if len(imported_results) > 0:
             try:
                 # Parse the original PDF data to get test names
-                parsed_data = json.loads(import_log.parsed_data) if import_log.parsed_data else {}
+                parsed_data = orjson.loads(import_log.parsed_data) if import_log.parsed_data else {}
                 if 'tests' in parsed_data:
                     # Get the names of imported lab tests that don't have test index in notes
-                    imported_lab_names = []
+                    imported_lab_names = set()
                     for result in imported_results:
                         # Only include results that don't have test index (old imports)
                         if result.lab and result.lab.name and not ("test index:" in (result.notes or "")):
-                            imported_lab_names.append(result.lab.name.lower().strip())
+                            imported_lab_names.add(result.lab.name.lower().strip())
                     
                     # Find matching test indices by name for tests not already tracked
+                    tracked_indices = set(imported_test_indices)
                     for test_index, test in enumerate(parsed_data['tests']):
                         # Skip if this test index is already tracked
-                        if test_index in imported_test_indices:
+                        if test_index in tracked_indices:
                             continue
                             
                         test_name = test.get('name', '').lower().strip()
@@ -884,9 +896,12 @@ async def get_import_details(import_id: int, db: Session = Depends(get_db)):
         # Update the database tests_imported count if it doesn't match the actual count
         actual_imported_count = len(imported_test_indices)
         if import_log.tests_imported != actual_imported_count:
-            import_log.tests_imported = actual_imported_count
+            db.execute(
+                update(PDFImportLog)
+                .where(PDFImportLog.id == import_id)
+                .values(tests_imported=actual_imported_count)
+            )
             db.commit()
-            db.refresh(import_log)
             # Update the return data as well
             import_data['tests_imported'] = actual_imported_count
         
@@ -894,14 +909,12 @@ async def get_import_details(import_id: int, db: Session = Depends(get_db)):
     
     return import_data
 
-@router.get("/history")
+@router.get("/history", response_model=List[PDFImportRead])
 async def get_import_history(db: Session = Depends(get_db)):
     """Get complete PDF import history ordered by date."""
-    imports = db.query(PDFImportLog).options(
+    return db.query(PDFImportLog).options(
         joinedload(PDFImportLog.provider)
     ).order_by(PDFImportLog.created_at.desc()).all()
-    
-    return [import_log.to_dict() for import_log in imports]
 
 @router.delete("/{import_id}")
 async def delete_pdf_import(
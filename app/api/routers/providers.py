@@ -1,13 +1,13 @@
 """Provider management routes."""
 
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
 
 from ..database import get_db
 from ..models import Provider as ProviderModel
-from ..schemas import ProviderCreate
+from ..schemas import ProviderCreate, ProviderRead
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ def _get_provider_or_404(provider_id: int, db: Session) -> ProviderModel:
         raise HTTPException(status_code=404, detail="Provider not found")
     return provider
 
-@router.get("/")
+@router.get("/", response_model=List[ProviderRead])
 def get_providers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -36,8 +36,7 @@ def get_providers(
             ProviderModel.specialty.contains(search)
         )
 
-    providers = query.offset(skip).limit(limit).all()
-    return [provider.to_dict() for provider in providers]
+    return query.offset(skip).limit(limit).all()
 
 @router.get("/{provider_id}")
 def get_provider(provider_id: int, db: Session = Depends(get_db)):
@@ -48,7 +47,9 @@ def get_provider(provider_id: int, db: Session = Depends(get_db)):
 @router.post("/")
 def create_provider(provider: ProviderCreate, db: Session = Depends(get_db)):
     """Create a new healthcare provider with duplicate name validation."""
-    existing = db.query(ProviderModel).filter(ProviderModel.name == provider.name).first()
+    existing = db.query(
+        db.query(ProviderModel.id).filter(ProviderModel.name == provider.name).exists()
+    ).scalar()
     if existing:
         raise HTTPException(status_code=400, detail="Provider with this name already exists")
 
@@ -68,10 +69,12 @@ def update_provider(provider_id: int, provider: ProviderCreate, db: Session = De
     """Update an existing provider."""
     db_provider = _get_provider_or_404(provider_id, db)
 
-    existing = db.query(ProviderModel).filter(
-        ProviderModel.name == provider.name,
-        ProviderModel.id != provider_id
-    ).first()
+    existing = db.query(
+        db.query(ProviderModel.id).filter(
+            ProviderModel.name == provider.name,
+            ProviderModel.id != provider_id
+        ).exists()
+    ).scalar()
     if existing:
         raise HTTPException(status_code=400, detail="Provider with this name already exists")
 
@@ -1,8 +1,10 @@
 """Lab Results API router"""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
+import orjson
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from typing import Optional
 
 from ..database import get_db
@@ -11,12 +13,17 @@ from ..models import (
     Lab as LabModel,
     Provider as ProviderModel,
     Patient as PatientModel,
-    Panel as PanelModel
+    Panel as PanelModel,
+    Unit as UnitModel,
+    result_is_normal,
+    result_status
 )
 from ..schemas import (
+    LAB_RESULT_ADAPTER,
     LabResultCreate,
     LabResultWithDetails,
-    PaginatedLabResults
+    PaginatedLabResults,
+    pagination_flags
 )
 router = APIRouter()
 
@@ -33,6 +40,13 @@ def _get_result_or_404(result_id: int, db: Session) -> LabResultModel:
         raise HTTPException(status_code=404, detail="Lab result not found")
     return result
 
+def _get_result_bare(result_id: int, db: Session) -> LabResultModel:
+    """Get result by primary key without eager loading or raise 404."""
+    result = db.get(LabResultModel, result_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Lab result not found")
+    return result
+
 def _build_results_query(
     db: Session,
     lab_id: Optional[int] = None,
@@ -41,13 +55,29 @@ def _build_results_query(
     date_to: Optional[str] = None,
     pdf_import_id: Optional[str] = None
 ):
-    """Build filtered query for lab results with eager loading."""
-    query = db.query(LabResultModel).options(
-        joinedload(LabResultModel.lab).joinedload(LabModel.unit),
-        joinedload(LabResultModel.lab).joinedload(LabModel.panel),
-        joinedload(LabResultModel.patient),
-        joinedload(LabResultModel.provider),
-        joinedload(LabResultModel.pdf_import)
+    """Build filtered query for flat lab result list rows, joining names in one statement."""
+    query = (
+        db.query(
+            LabResultModel.id,
+            LabResultModel.result,
+            LabResultModel.result_text,
+            # SQLite formats the ISO timestamp, so no datetime objects are built per row
+            func.strftime("%Y-%m-%dT%H:%M:%S", LabResultModel.date_collected).label("date_collected"),
+            LabModel.name.label("lab_name"),
+            PanelModel.name.label("panel_name"),
+            UnitModel.name.label("unit_name"),
+            PatientModel.name.label("patient_name"),
+            ProviderModel.name.label("provider_name"),
+            LabModel.ref_low,
+            LabModel.ref_high,
+            LabModel.ref_type,
+            LabModel.ref_value
+        )
+        .outerjoin(LabModel, LabResultModel.lab_id == LabModel.id)
+        .outerjoin(PanelModel, LabModel.panel_id == PanelModel.id)
+        .outerjoin(UnitModel, LabModel.unit_id == UnitModel.id)
+        .outerjoin(PatientModel, LabResultModel.patient_id == PatientModel.id)
+        .outerjoin(ProviderModel, LabResultModel.provider_id == ProviderModel.id)
     )
 
     if lab_id:
@@ -63,7 +93,36 @@ def _build_results_query(
 
     return query
 
-@router.get("/")
+def _fill_result_row(out: dict, row) -> dict:
+    """Fill out with a list query row in the LabResultListRow shape and return it."""
+    # The row carries the lab's ref_* columns, so the reference range rules apply to it directly
+    if row.lab_name is not None and row.result is not None:
+        ref = (row.ref_type, row.ref_low, row.ref_high, row.ref_value)
+        status = result_status(*ref, row.result)
+        is_normal = result_is_normal(*ref, row.result)
+    else:
+        status, is_normal = "unknown", True
+    out["id"] = row.id
+    out["result"] = row.result
+    out["result_text"] = row.result_text
+    out["lab_name"] = row.lab_name
+    out["panel_name"] = row.panel_name
+    out["unit_name"] = row.unit_name
+    out["patient_name"] = row.patient_name
+    out["provider_name"] = row.provider_name
+    out["date_collected"] = row.date_collected
+    out["status"] = status
+    out["is_normal"] = is_normal
+    return out
+
+def _results_json(rows) -> orjson.Fragment:
+    """Serialize list rows as a JSON array, refilling one scratch dict rather than allocating one per row."""
+    scratch = {}
+    return orjson.Fragment(
+        b"[" + b",".join(orjson.dumps(_fill_result_row(scratch, row)) for row in rows) + b"]"
+    )
+
+@router.get("/", response_model=PaginatedLabResults)
 def get_results(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -76,48 +135,59 @@ def get_results(
 ):
     """Get lab results with optional filtering and pagination."""
     base_query = _build_results_query(db, lab_id, provider_id, date_from, date_to, pdf_import_id)
+
+    # Window count returns the filtered total alongside the page in one round-trip
+    rows = (
+        base_query.add_columns(func.count().over().label("total_count"))
+        .order_by(desc(LabResultModel.date_collected))
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    if rows:
+        total_count = rows[0].total_count
+    else:
+        # Page past the end has no rows to carry the window count
+        total_count = base_query.count() if skip else 0
     
-    total_count = base_query.count()
-    results = base_query.order_by(desc(LabResultModel.date_collected)).offset(skip).limit(limit).all()
-    
-    page = (skip // limit) + 1 if limit > 0 else 1
-    total_pages = (total_count + limit - 1) // limit if limit > 0 else 1
-    has_next = skip + len(results) < total_count
-    has_prev = skip > 0
+    page = (skip // limit) + 1
     
-    return PaginatedLabResults(
-        results=results,
-        total_count=total_count,
-        page=page,
-        page_size=limit,
-        total_pages=total_pages,
-        has_next=has_next,
-        has_prev=has_prev
-    )
+    # Rows come from the database, so serialize them directly without revalidating them;
+    # the page flags use the same helper as PaginatedLabResults' computed fields
+    return ORJSONResponse({
+        "results": _results_json(rows),
+        "total_count": total_count,
+        "page": page,
+        "page_size": limit,
+        "skip": skip,
+        **pagination_flags(skip, len(rows), limit, total_count)
+    })
 
 
-@router.get("/{result_id}")
+@router.get("/{result_id}", response_model=LabResultWithDetails)
 def get_result(result_id: int, db: Session = Depends(get_db)):
     """Get a specific lab result by ID with full relationship details."""
-    return _get_result_or_404(result_id, db)
+    result = LabResultWithDetails.from_orm_fast(_get_result_or_404(result_id, db))
+    # Serialize straight to JSON bytes; returning a Response skips FastAPI's re-encoding
+    return Response(LAB_RESULT_ADAPTER.dump_json(result), media_type="application/json")
 
 
 @router.put("/{result_id}")
 def update_result(result_id: int, result: LabResultCreate, db: Session = Depends(get_db)):
     """Update an existing lab result with validation."""
-    db_result = _get_result_or_404(result_id, db)
+    db_result = _get_result_bare(result_id, db)
 
-    # Validate relationships
-    lab = db.query(LabModel).filter(LabModel.id == result.lab_id).first()
-    if not lab:
+    # Validate relationships in a single round-trip
+    lab_exists, provider_exists, patient_exists = db.query(
+        db.query(LabModel.id).filter(LabModel.id == result.lab_id).exists(),
+        db.query(ProviderModel.id).filter(ProviderModel.id == result.provider_id).exists(),
+        db.query(PatientModel.id).filter(PatientModel.id == result.patient_id).exists()
+    ).one()
+    if not lab_exists:
         raise HTTPException(status_code=400, detail="Lab not found")
-
-    provider = db.query(ProviderModel).filter(ProviderModel.id == result.provider_id).first()
-    if not provider:
+    if not provider_exists:
         raise HTTPException(status_code=400, detail="Provider not found")
-
-    patient = db.query(PatientModel).filter(PatientModel.id == result.patient_id).first()
-    if not patient:
+    if not patient_exists:
         raise HTTPException(status_code=400, detail="Patient not found")
 
     for key, value in result.model_dump().items():
@@ -135,7 +205,7 @@ def update_result(result_id: int, result: LabResultCreate, db: Session = Depends
 @router.delete("/{result_id}")
 def delete_result(result_id: int, db: Session = Depends(get_db)):
     """Delete a lab result by ID."""
-    db_result = _get_result_or_404(result_id, db)
+    db_result = _get_result_bare(result_id, db)
     
     db.delete(db_result)
     db.commit()
@@ -1,26 +1,41 @@
 """Settings management routes."""
 
+import hashlib
 import json
+import os
 import shutil
 import zipfile
-from datetime import datetime
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache, partial
+from io import RawIOBase
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional, Union
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, UploadFile, File, Form
 from fastapi.responses import StreamingResponse
+import orjson
 from pydantic import BaseModel
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload, raiseload
 
-from ..database import get_db
+from ..database import SessionLocal, data_generation, get_db
 from ..models import (
     LabResult as LabResultModel, Lab as LabModel,
     Patient as PatientModel, Provider as ProviderModel,
     Panel as PanelModel, PDFImportLog, Unit as UnitModel,
-    UserSettings as UserSettingsModel
+    UserSettings as UserSettingsModel, format_reference_range
 )
 from ..schemas import APIResponse, UserSettings, UserSettingsUpdate
+from ..utils.cache import api_cache
 
 router = APIRouter()
 
@@ -69,12 +84,32 @@ class ImportResponse(BaseModel):
 
 # Database-backed settings (replaced in-memory storage)
 
-@router.get("/user")
-def get_user_settings(db: Session = Depends(get_db)):
+def _etag_response(payload: dict, request: Request) -> Response:
+    """Return payload as JSON with an ETag, or an empty 304 if the client copy is current."""
+    body = orjson.dumps(payload)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, must-revalidate"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _user_settings_payload(settings: dict) -> dict:
+    """Shape a stored settings dictionary like the UserSettings schema without validating it."""
+    return {
+        "sidebar_open": settings.get("sidebar_open", True),
+        "dark_mode": settings.get("dark_mode", False),
+        "date_format": settings.get("date_format", "MM/DD/YYYY"),
+        "id": settings["id"],
+        "user_id": settings["user_id"],
+        "created_at": settings["created_at"],
+        "updated_at": settings["updated_at"]
+    }
+
+@router.get("/user", response_model=UserSettings)
+def get_user_settings(request: Request, db: Session = Depends(get_db)):
     """Get user settings from database."""
     try:
-        settings = UserSettingsModel.get_settings(db)
-        return UserSettings.model_validate(settings.to_dict())
+        return _etag_response(_user_settings_payload(UserSettingsModel.get_settings_dict(db)), request)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -88,7 +123,7 @@ def update_user_settings(
 ):
     """Update user settings in database."""
     try:
-        update_data = {k: v for k, v in settings_update.model_dump().items() if v is not None}
+        update_data = settings_update.model_dump(exclude_unset=True, exclude_none=True)
         settings = UserSettingsModel.update_settings(db, **update_data)
         return UserSettings.model_validate(settings.to_dict())
     except Exception as e:
@@ -98,13 +133,12 @@ def update_user_settings(
         ) from e
 
 @router.get("/")
-def get_settings(db: Session = Depends(get_db)):
+def get_settings(request: Request, db: Session = Depends(get_db)):
     """Get current application settings and preferences (legacy endpoint)."""
     try:
-        user_settings = UserSettingsModel.get_settings(db)
-        return {
-            "dark_mode": user_settings.get_option('dark_mode', False)
-        }
+        return _etag_response({
+            "dark_mode": UserSettingsModel.get_settings_dict(db).get('dark_mode', False)
+        }, request)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -155,32 +189,21 @@ def update_dark_mode_put(
 def reset_data(db: Session = Depends(get_db)):
     """Reset all application data to initial state (DESTRUCTIVE OPERATION)."""
     try:
-        # Delete all data in correct dependency order to avoid foreign key constraint errors
+        # Delete all data in correct dependency order to avoid foreign key constraint errors.
+        # Everything runs in one transaction; the session holds no loaded rows to synchronize.
         # 1. First delete LabResults (depends on Lab, Patient, Provider)
-        db.query(LabResultModel).delete()
-        db.commit()  # Commit this deletion first
+        db.query(LabResultModel).delete(synchronize_session=False)
 
         # 2. Then delete Labs (depends on Panel, Unit)  
-        db.query(LabModel).delete()
-        db.commit()  # Commit this deletion
+        db.query(LabModel).delete(synchronize_session=False)
 
         # 3. Finally delete the remaining entities (no interdependencies)
-        db.query(PatientModel).delete()
-        db.query(ProviderModel).delete()
-        db.query(PanelModel).delete()
-        db.query(UnitModel).delete()
-        db.query(PDFImportLog).delete()
-        db.query(UserSettingsModel).delete()  # Also reset user settings
-        db.commit()
-
-        # Clean up uploaded PDF files
-        pdf_dir = Path("/app/data/uploads/pdfs")
-        if pdf_dir.exists():
-            for pdf_file in pdf_dir.glob("*.pdf"):
-                try:
-                    pdf_file.unlink()
-                except Exception:
-                    continue  # Continue if file can't be deleted
+        db.query(PatientModel).delete(synchronize_session=False)
+        db.query(ProviderModel).delete(synchronize_session=False)
+        db.query(PanelModel).delete(synchronize_session=False)
+        db.query(UnitModel).delete(synchronize_session=False)
+        db.query(PDFImportLog).delete(synchronize_session=False)
+        db.query(UserSettingsModel).delete(synchronize_session=False)  # Also reset user settings
 
         # Recreate default patient with ID 1
         default_patient = PatientModel(id=1, name="Default Patient")
@@ -199,8 +222,11 @@ def reset_data(db: Session = Depends(get_db)):
 
         db.commit()
 
+        # Clean up uploaded PDF files, keeping several unlinks in flight at once
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            executor.map(_safe_unlink, [entry.path for entry in _iter_pdfs(Path("/app/data/uploads/pdfs"))])
+
         # Clear all cache after data reset
-        from ..utils.cache import api_cache
         api_cache.clear()
 
         return APIResponse(
@@ -215,41 +241,10 @@ def reset_data(db: Session = Depends(get_db)):
         ) from e
 
 @router.get("/data-counts")
-def get_data_counts(db: Session = Depends(get_db)):
+def get_data_counts(request: Request, db: Session = Depends(get_db)):
     """Get comprehensive counts of all data types in the system."""
     try:
-        lab_results_count = db.query(LabResultModel).count()
-        labs_count = db.query(LabModel).count()
-        panels_count = db.query(PanelModel).count()
-        patients_count = db.query(PatientModel).count()
-        providers_count = db.query(ProviderModel).count()
-        units_count = db.query(UnitModel).count()
-        pdf_imports_count = db.query(PDFImportLog).count()
-
-        # Count PDF files in the uploads directory
-        pdf_dir = Path("/app/data/uploads/pdfs")
-        pdf_files_count = 0
-        if pdf_dir.exists():
-            pdf_files_count = len(list(pdf_dir.glob("*.pdf")))
-
-        total_items = (
-            lab_results_count + labs_count + panels_count + patients_count + providers_count + units_count + pdf_imports_count + pdf_files_count
-        )
-
-        return {
-            "success": True,
-            "data": {
-                "lab_results": lab_results_count,
-                "labs": labs_count,
-                "panels": panels_count,
-                "providers": providers_count,
-                "patients": patients_count,
-                "units": units_count,
-                "pdf_imports": pdf_imports_count,
-                "pdf_files": pdf_files_count
-            },
-            "total_items": total_items
-        }
+        return _etag_response(_cached_for_data("data_counts", db, lambda: _compute_data_counts(db)), request)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -263,62 +258,11 @@ def get_export_preview(
 ):
     """Generate a preview of what will be exported."""
     try:
-        # Determine patient IDs
-        patient_ids = _get_patient_ids(config.patients, db)
-        
-        # Build base queries
-        lab_results_query = db.query(LabResultModel)
-        
-        # Apply patient filter
-        if patient_ids and 'all' not in config.patients:
-            lab_results_query = lab_results_query.filter(LabResultModel.patient_id.in_(patient_ids))
-        
-        # Apply date range filter
-        if config.date_range:
-            if config.date_range.start:
-                lab_results_query = lab_results_query.filter(
-                    LabResultModel.date_collected >= config.date_range.start
-                )
-            if config.date_range.end:
-                lab_results_query = lab_results_query.filter(
-                    LabResultModel.date_collected <= config.date_range.end
-                )
-        
-        # Get counts
-        lab_results_count = lab_results_query.count()
-        
-        # Get related data counts
-        patients_count = len(patient_ids) if patient_ids and 'all' not in config.patients else db.query(PatientModel).count()
-        labs_count = db.query(LabModel).count()
-        providers_count = db.query(ProviderModel).count()
-        panels_count = db.query(PanelModel).count()
-        units_count = db.query(UnitModel).count()
-        
-        # Count PDF files
-        pdf_files_count = 0
-        if config.include_pdfs:
-            pdf_dir = Path("/app/data/uploads/pdfs")
-            if pdf_dir.exists():
-                pdf_files_count = len(list(pdf_dir.glob("*.pdf")))
-        
-        # Estimate size
-        estimated_size = _estimate_export_size(
-            lab_results_count, patients_count, labs_count, 
-            providers_count, panels_count, units_count, 
-            pdf_files_count, config.include_pdfs
-        )
-        
-        return ExportPreviewResponse(
-            patients_count=patients_count,
-            lab_results_count=lab_results_count,
-            labs_count=labs_count,
-            providers_count=providers_count,
-            panels_count=panels_count,
-            units_count=units_count,
-            pdf_files_count=pdf_files_count,
-            estimated_size=estimated_size,
-            include_pdfs=config.include_pdfs
+        preview = _cached_for_data(
+            _export_preview_key(config), db,
+            lambda: _compute_export_preview(config, db).model_dump()
         )
+        return ExportPreviewResponse.model_validate(preview)
         
     except Exception as e:
         raise HTTPException(
@@ -327,51 +271,32 @@ def get_export_preview(
         ) from e
 
 @router.post("/export")
-def export_data(
-    config: ExportConfiguration,
-    db: Session = Depends(get_db)
-):
+def export_data(config: ExportConfiguration):
     """Export data based on configuration."""
     try:
-        # Generate export data
-        export_data = _generate_export_data(config, db)
+        # Start the export stream now so query failures still surface as a 500
+        json_chunks = _stream_export_json(config)
+        json_chunks = chain((next(json_chunks),), json_chunks)
         
         # Create filename
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         patient_suffix = "all" if 'all' in config.patients else f"{len(config.patients)}-patients"
         
         if config.include_pdfs:
-            # Create ZIP file
-            zip_buffer = BytesIO()
+            # Stream the ZIP file as it is built
             filename = f"mylabvault_export_{timestamp}_{patient_suffix}.zip"
             
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # Add JSON data
-                zip_file.writestr("data.json", json.dumps(export_data, indent=2, default=str))
-                
-                # Add PDF files
-                pdf_dir = Path("/app/data/uploads/pdfs")
-                if pdf_dir.exists():
-                    for pdf_file in pdf_dir.glob("*.pdf"):
-                        try:
-                            zip_file.write(pdf_file, f"pdfs/{pdf_file.name}")
-                        except Exception:
-                            continue  # Skip files that can't be read
-            
-            zip_buffer.seek(0)
-            
             return StreamingResponse(
-                BytesIO(zip_buffer.read()),
+                _stream_export_zip(json_chunks, Path("/app/data/uploads/pdfs")),
                 media_type="application/zip",
                 headers={"Content-Disposition": f"attachment; filename={filename}"}
             )
         else:
-            # Return JSON file
+            # Stream the JSON file as it is serialized
             filename = f"mylabvault_export_{timestamp}_{patient_suffix}.json"
-            json_data = json.dumps(export_data, indent=2, default=str)
             
-            return Response(
-                content=json_data,
+            return StreamingResponse(
+                json_chunks,
                 media_type="application/json",
                 headers={"Content-Disposition": f"attachment; filename={filename}"}
             )
@@ -389,9 +314,8 @@ def preview_import_file(
 ):
     """Preview what will be imported from a file."""
     try:
-        # Read file content
-        file_content = import_file.file.read()
-        file_size = len(file_content)
+        # Measure the upload without reading it into memory
+        file_size = import_file.file.seek(0, os.SEEK_END)
         import_file.file.seek(0)  # Reset file pointer
         
         # Determine file type
@@ -402,24 +326,25 @@ def preview_import_file(
         if import_file.filename.lower().endswith('.json'):
             file_type = "JSON"
             try:
-                export_data = json.loads(file_content.decode('utf-8'))
-            except json.JSONDecodeError:
+                export_data = orjson.loads(import_file.file.read())
+            except orjson.JSONDecodeError:
                 raise HTTPException(status_code=400, detail="Invalid JSON format")
                 
         elif import_file.filename.lower().endswith('.zip'):
             file_type = "ZIP"
             try:
-                with zipfile.ZipFile(BytesIO(file_content), 'r') as zip_file:
+                with zipfile.ZipFile(import_file.file, 'r') as zip_file:
+                    data_info, pdf_infos = _scan_import_zip(zip_file)
+                    
                     # Look for data.json in the ZIP
-                    if 'data.json' in zip_file.namelist():
-                        json_content = zip_file.read('data.json')
-                        export_data = json.loads(json_content.decode('utf-8'))
+                    if data_info is not None:
+                        with zip_file.open(data_info) as json_file:
+                            export_data = orjson.loads(json_file.read())
                     else:
                         raise HTTPException(status_code=400, detail="ZIP file does not contain data.json")
                     
                     # Count PDF files
-                    pdf_files = [f for f in zip_file.namelist() if f.startswith('pdfs/') and f.endswith('.pdf')]
-                    pdf_files_count = len(pdf_files)
+                    pdf_files_count = len(pdf_infos)
                     
             except zipfile.BadZipFile:
                 raise HTTPException(status_code=400, detail="Invalid ZIP file format")
@@ -446,12 +371,7 @@ def preview_import_file(
         conflicts = _check_import_conflicts(export_data, db)
         
         # Format file size
-        if file_size < 1024:
-            file_size_str = f"{file_size} bytes"
-        elif file_size < 1024 * 1024:
-            file_size_str = f"{file_size / 1024:.1f} KB"
-        else:
-            file_size_str = f"{file_size / (1024 * 1024):.1f} MB"
+        file_size_str = _human_size(file_size)
         
         return ImportPreviewResponse(
             file_type=file_type,
@@ -477,6 +397,7 @@ def preview_import_file(
 
 @router.post("/import")
 def import_data(
+    background_tasks: BackgroundTasks,
     import_file: UploadFile = File(...),
     merge_data: bool = Form(True),
     validate_data: bool = Form(True),
@@ -485,48 +406,47 @@ def import_data(
 ):
     """Import data from exported file."""
     try:
-        # Read and validate file
-        file_content = import_file.file.read()
-        export_data = None
-        pdf_files = {}
-        
-        if import_file.filename.lower().endswith('.json'):
-            try:
-                export_data = json.loads(file_content.decode('utf-8'))
-            except json.JSONDecodeError:
-                raise HTTPException(status_code=400, detail="Invalid JSON format")
-                
-        elif import_file.filename.lower().endswith('.zip'):
-            try:
-                with zipfile.ZipFile(BytesIO(file_content), 'r') as zip_file:
+        # The upload is read in place; ZIP members are streamed out on demand
+        with ExitStack() as stack:
+            export_data = None
+            pdf_files = {}
+            
+            if import_file.filename.lower().endswith('.json'):
+                try:
+                    export_data = orjson.loads(import_file.file.read())
+                except orjson.JSONDecodeError:
+                    raise HTTPException(status_code=400, detail="Invalid JSON format")
+                    
+            elif import_file.filename.lower().endswith('.zip'):
+                try:
+                    zip_file = stack.enter_context(zipfile.ZipFile(import_file.file, 'r'))
+                    data_info, pdf_infos = _scan_import_zip(zip_file)
+                    
                     # Extract data.json
-                    if 'data.json' in zip_file.namelist():
-                        json_content = zip_file.read('data.json')
-                        export_data = json.loads(json_content.decode('utf-8'))
+                    if data_info is not None:
+                        with zip_file.open(data_info) as json_file:
+                            export_data = orjson.loads(json_file.read())
                     else:
                         raise HTTPException(status_code=400, detail="ZIP file does not contain data.json")
                     
-                    # Extract PDF files
-                    for file_path in zip_file.namelist():
-                        if file_path.startswith('pdfs/') and file_path.endswith('.pdf'):
-                            pdf_content = zip_file.read(file_path)
-                            pdf_filename = Path(file_path).name
-                            pdf_files[pdf_filename] = pdf_content
+                    # Collect PDF members; contents are copied to disk during the import
+                    for info in pdf_infos:
+                        pdf_files[Path(info.filename).name] = partial(zip_file.open, info)
                             
-            except zipfile.BadZipFile:
-                raise HTTPException(status_code=400, detail="Invalid ZIP file format")
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file type")
-        
-        if not export_data:
-            raise HTTPException(status_code=400, detail="No valid export data found")
-        
-        # Validate data if requested
-        if validate_data:
-            _validate_import_data(export_data)
-        
-        # Perform the import
-        import_result = _perform_data_import(export_data, pdf_files, merge_data, start_from_scratch, db)
+                except zipfile.BadZipFile:
+                    raise HTTPException(status_code=400, detail="Invalid ZIP file format")
+            else:
+                raise HTTPException(status_code=400, detail="Unsupported file type")
+            
+            if not export_data:
+                raise HTTPException(status_code=400, detail="No valid export data found")
+            
+            # Validate data if requested
+            if validate_data:
+                _validate_import_data(export_data)
+            
+            # Perform the import
+            import_result = _perform_data_import(export_data, pdf_files, merge_data, start_from_scratch, db, background_tasks)
         
         return ImportResponse(
             success=True,
@@ -545,6 +465,236 @@ def import_data(
             detail=f'Failed to import data: {str(e)}'
         ) from e
 
+def _scan_import_zip(zip_file: zipfile.ZipFile):
+    """Find the data.json member and the pdfs/*.pdf members in one pass over the archive."""
+    data_info = None
+    pdf_infos = []
+    for info in zip_file.infolist():
+        filename = info.filename
+        if filename == 'data.json':
+            data_info = info
+        elif filename.startswith('pdfs/') and filename.endswith('.pdf'):
+            pdf_infos.append(info)
+    return data_info, pdf_infos
+
+def _data_signature(db: Session) -> list:
+    """Cheap fingerprint of stored data: the write generation, each table's MAX(id) and the PDF directory mtime.
+
+    The generation catches committed inserts, updates and deletes made through
+    the app; MAX(id) and the mtime catch changes made outside it.
+    """
+    generation = data_generation()
+    max_ids = db.execute(select(*(
+        select(func.max(model.id)).scalar_subquery()
+        for model in (
+            LabResultModel, LabModel, PanelModel, PatientModel,
+            ProviderModel, UnitModel, PDFImportLog
+        )
+    ))).one()
+    try:
+        pdf_dir_mtime = os.stat("/app/data/uploads/pdfs").st_mtime_ns
+    except FileNotFoundError:
+        pdf_dir_mtime = 0
+    return [generation, *max_ids, pdf_dir_mtime]
+
+def _cached_for_data(key: str, db: Session, compute) -> dict:
+    """Return compute() cached under key until the data signature changes."""
+    signature = _data_signature(db)
+    entry = api_cache.get(key)
+    if entry is not None and entry["signature"] == signature:
+        return entry["value"]
+    value = compute()
+    api_cache.set(key, {"signature": signature, "value": value})
+    return value
+
+def _compute_data_counts(db: Session) -> dict:
+    """Build the data-counts payload."""
+    # Fetch all table counts in a single round trip
+    (
+        lab_results_count, labs_count, panels_count, patients_count,
+        providers_count, units_count, pdf_imports_count
+    ) = _fetch_counts(db, *(
+        _count_stmt(model) for model in (
+            LabResultModel, LabModel, PanelModel, PatientModel,
+            ProviderModel, UnitModel, PDFImportLog
+        )
+    ))
+
+    # Count PDF files in the uploads directory
+    pdf_files_count = _count_pdfs(Path("/app/data/uploads/pdfs"))
+
+    total_items = (
+        lab_results_count + labs_count + panels_count + patients_count + providers_count + units_count + pdf_imports_count + pdf_files_count
+    )
+
+    return {
+        "success": True,
+        "data": {
+            "lab_results": lab_results_count,
+            "labs": labs_count,
+            "panels": panels_count,
+            "providers": providers_count,
+            "patients": patients_count,
+            "units": units_count,
+            "pdf_imports": pdf_imports_count,
+            "pdf_files": pdf_files_count
+        },
+        "total_items": total_items
+    }
+
+def _compute_export_preview(config: ExportConfiguration, db: Session) -> ExportPreviewResponse:
+    """Build the export preview for config."""
+    # Determine patient IDs
+    patient_ids = _get_patient_ids(config.patients, db)
+    
+    filters = _lab_results_filters(config, patient_ids)
+    
+    # Get lab result and related data counts in a single round trip
+    (
+        lab_results_count, all_patients_count, labs_count,
+        providers_count, panels_count, units_count
+    ) = _fetch_counts(
+        db,
+        _count_stmt(LabResultModel, *filters),
+        _count_stmt(PatientModel),
+        _count_stmt(LabModel),
+        _count_stmt(ProviderModel),
+        _count_stmt(PanelModel),
+        _count_stmt(UnitModel)
+    )
+    patients_count = len(patient_ids) if patient_ids and 'all' not in config.patients else all_patients_count
+    
+    # Count PDF files, sampling a few for their typical size
+    pdf_files_count = 0
+    pdf_file_size = 0
+    if config.include_pdfs:
+        pdf_files_count, pdf_file_size = _sample_pdf_files(Path("/app/data/uploads/pdfs"))
+    
+    # Estimate size from sampled row and file sizes
+    estimated_size = _estimate_export_size(
+        lab_results_count, patients_count, labs_count, 
+        providers_count, panels_count, units_count, 
+        pdf_files_count, config.include_pdfs,
+        lab_result_size=_sample_lab_result_size(db) if lab_results_count else 0,
+        pdf_file_size=pdf_file_size
+    )
+    
+    return ExportPreviewResponse(
+        patients_count=patients_count,
+        lab_results_count=lab_results_count,
+        labs_count=labs_count,
+        providers_count=providers_count,
+        panels_count=panels_count,
+        units_count=units_count,
+        pdf_files_count=pdf_files_count,
+        estimated_size=estimated_size,
+        include_pdfs=config.include_pdfs
+    )
+
+def _export_preview_key(config: ExportConfiguration) -> str:
+    """Cache key for the export preview of config."""
+    return f"export_preview:{config.model_dump_json()}"
+
+def _lab_results_filters(config: ExportConfiguration, patient_ids: List[int]) -> list:
+    """Build the lab result filters shared by the export preview and the export."""
+    filters = []
+    if patient_ids and 'all' not in config.patients:
+        filters.append(LabResultModel.patient_id.in_(patient_ids))
+    
+    if config.date_range:
+        if config.date_range.start:
+            filters.append(LabResultModel.date_collected >= config.date_range.start)
+        if config.date_range.end:
+            filters.append(LabResultModel.date_collected <= config.date_range.end)
+    
+    return filters
+
+def _cached_lab_results_count(config: ExportConfiguration, filters: list, db: Session) -> int:
+    """Count exported lab results, reusing the preview's count while the data is unchanged."""
+    entry = api_cache.get(_export_preview_key(config))
+    if entry is not None and entry["signature"] == _data_signature(db):
+        return entry["value"]["lab_results_count"]
+    return db.execute(_count_stmt(LabResultModel, *filters)).scalar_one()
+
+def _count_stmt(model, *filters):
+    """Build a COUNT(*) select over model's table, optionally filtered."""
+    return select(func.count()).select_from(model).where(*filters)
+
+def _fetch_counts(db: Session, *count_stmts) -> tuple:
+    """Run several COUNT selects as scalar subqueries of one statement."""
+    return tuple(db.execute(select(*(stmt.scalar_subquery() for stmt in count_stmts))).one())
+
+def _iter_pdfs(pdf_dir: Path):
+    """Yield directory entries for PDF files in pdf_dir, skipping a missing directory."""
+    try:
+        with os.scandir(pdf_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.pdf') and entry.is_file(follow_symlinks=False):
+                    yield entry
+    except FileNotFoundError:
+        return
+
+def _count_pdfs(pdf_dir: Path) -> int:
+    """Count PDF files in pdf_dir using cached directory-entry types."""
+    return sum(1 for _ in _iter_pdfs(pdf_dir))
+
+def _safe_unlink(path: str):
+    """Delete a file, ignoring files that can't be deleted."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+class _ZipStreamWriter(RawIOBase):
+    """Write-only, unseekable sink that queues ZIP output for a streaming response."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = deque()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self):
+        """Yield and discard all chunks written so far."""
+        while self._chunks:
+            yield self._chunks.popleft()
+
+def _stream_export_zip(json_chunks, pdf_dir: Path):
+    """Yield an export ZIP (data.json plus uploaded PDFs) chunk by chunk."""
+    stream = _ZipStreamWriter()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_STORED) as zip_file:
+        # Add JSON data, compressing it as it is generated
+        data_info = zipfile.ZipInfo("data.json", date_time=datetime.now().timetuple()[:6])
+        data_info.compress_type = zipfile.ZIP_DEFLATED
+        data_info.external_attr = 0o600 << 16
+        with zip_file.open(data_info, 'w', force_zip64=True) as data_file:
+            for chunk in json_chunks:
+                data_file.write(chunk)
+                yield from stream.drain()
+        yield from stream.drain()
+
+        # Add PDF files; they are already compressed, so store them as-is,
+        # copying in 1 MB chunks so a large PDF is never held in memory whole
+        for entry in _iter_pdfs(pdf_dir):
+            try:
+                pdf_info = zipfile.ZipInfo.from_file(entry.path, f"pdfs/{entry.name}")
+                pdf_file = open(entry.path, 'rb')
+            except OSError:
+                continue  # Skip files that can't be read
+            with pdf_file, zip_file.open(pdf_info, 'w') as zip_entry:
+                while chunk := pdf_file.read(1024 * 1024):
+                    zip_entry.write(chunk)
+                    yield from stream.drain()
+            yield from stream.drain()
+
+    # Central directory is written on close
+    yield from stream.drain()
+
 def _get_patient_ids(patients: Union[List[str], List[int]], db: Session) -> List[int]:
     """Convert patient selection to list of patient IDs."""
     if 'all' in patients:
@@ -555,78 +705,123 @@ def _get_patient_ids(patients: Union[List[str], List[int]], db: Session) -> List
         return [int(p) if isinstance(p, str) else p for p in patients]
 
 def _generate_export_data(config: ExportConfiguration, db: Session) -> dict:
-    """Generate the complete export data structure."""
+    """Generate the complete export data structure.
+
+    Every section except export_info is a lazy iterable of row dictionaries, consumed
+    once by _export_json_chunks; rows are fetched in batches of 1000.
+    """
     patient_ids = _get_patient_ids(config.patients, db)
     
-    # Build lab results query with relationships
-    lab_results_query = db.query(LabResultModel).options(
-        joinedload(LabResultModel.lab).joinedload(LabModel.unit),
-        joinedload(LabResultModel.lab).joinedload(LabModel.panel),
-        joinedload(LabResultModel.provider),
-        joinedload(LabResultModel.patient)
+    # Select only the columns the export needs as plain rows; order matches _lab_result_to_export
+    lab_results_stmt = (
+        select(
+            LabResultModel.id, LabResultModel.patient_id, PatientModel.name,
+            LabResultModel.lab_id, LabModel.name, LabResultModel.provider_id, ProviderModel.name,
+            LabResultModel.result, LabResultModel.result_text, LabResultModel.date_collected,
+            LabResultModel.notes, UnitModel.name, PanelModel.name,
+            LabModel.ref_low, LabModel.ref_high, LabModel.ref_value, LabModel.ref_type
+        )
+        .select_from(LabResultModel)
+        .outerjoin(PatientModel, LabResultModel.patient_id == PatientModel.id)
+        .outerjoin(LabModel, LabResultModel.lab_id == LabModel.id)
+        .outerjoin(UnitModel, LabModel.unit_id == UnitModel.id)
+        .outerjoin(PanelModel, LabModel.panel_id == PanelModel.id)
+        .outerjoin(ProviderModel, LabResultModel.provider_id == ProviderModel.id)
     )
     
-    # Apply filters
-    if patient_ids and 'all' not in config.patients:
-        lab_results_query = lab_results_query.filter(LabResultModel.patient_id.in_(patient_ids))
-    
-    if config.date_range:
-        if config.date_range.start:
-            lab_results_query = lab_results_query.filter(
-                LabResultModel.date_collected >= config.date_range.start
-            )
-        if config.date_range.end:
-            lab_results_query = lab_results_query.filter(
-                LabResultModel.date_collected <= config.date_range.end
-            )
+    filters = _lab_results_filters(config, patient_ids)
+    lab_results_stmt = lab_results_stmt.where(*filters)
     
-    # Get data
-    lab_results = lab_results_query.all()
+    # Lab results are streamed in batches rather than loaded at once
+    lab_results_count = _cached_lab_results_count(config, filters, db)
     
-    # Get related data
+    # Get related data; every section is fetched in batches as it is serialized
     if patient_ids and 'all' not in config.patients:
-        patients = db.query(PatientModel).filter(PatientModel.id.in_(patient_ids)).all()
+        patients = db.query(PatientModel).options(raiseload("*")).filter(PatientModel.id.in_(patient_ids)).yield_per(1000)
     else:
-        patients = db.query(PatientModel).all()
+        patients = db.query(PatientModel).options(raiseload("*")).yield_per(1000)
     
-    providers = db.query(ProviderModel).all()
-    panels = db.query(PanelModel).all()
-    units = db.query(UnitModel).all()
+    providers = db.query(ProviderModel).options(raiseload("*")).yield_per(1000)
+    panels = db.query(PanelModel).options(raiseload("*")).yield_per(1000)
+    units = db.query(UnitModel).options(raiseload("*")).yield_per(1000)
     labs = db.query(LabModel).options(
         joinedload(LabModel.unit),
-        joinedload(LabModel.panel)
-    ).all()
+        joinedload(LabModel.panel),
+        raiseload("*")
+    ).yield_per(1000)
     
-    # Convert to dictionaries
+    # Rows are converted to dictionaries as they are serialized
     export_data = {
         "export_info": {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(),
             "version": "1.0",
             "patient_selection": "all" if 'all' in config.patients else "selected",
             "selected_patients": patient_ids if 'all' not in config.patients else None,
             "date_range": config.date_range.model_dump() if config.date_range else None,
             "include_pdfs": config.include_pdfs,
-            "total_records": len(lab_results)
+            "total_records": lab_results_count
         },
-        "patients": [_patient_to_dict(p) for p in patients],
-        "providers": [_provider_to_dict(p) for p in providers],
-        "panels": [_panel_to_dict(p) for p in panels],
-        "units": [_unit_to_dict(u) for u in units],
-        "labs": [_lab_to_dict(l) for l in labs],
-        "lab_results": [_lab_result_to_dict(lr) for lr in lab_results]
+        "patients": map(_patient_to_dict, patients),
+        "providers": map(_provider_to_dict, providers),
+        "panels": map(_panel_to_dict, panels),
+        "units": map(_unit_to_dict, units),
+        "labs": map(_lab_to_dict, labs),
+        "lab_results": map(_lab_result_to_export, db.execute(lab_results_stmt.execution_options(yield_per=1000)))
     }
     
     return export_data
 
+def _orjson_default(obj):
+    """Serialize Decimal values (from Numeric columns), which orjson does not handle natively."""
+    if type(obj) is Decimal:
+        return float(obj)
+    raise TypeError
+
+def _export_json_chunks(export_data: dict):
+    """Yield export_data as JSON, one top-level section and one list row at a time."""
+    separator = b'{\n  '
+    for key, value in export_data.items():
+        yield separator + orjson.dumps(key) + b': '
+        separator = b',\n  '
+        if isinstance(value, dict):
+            yield orjson.dumps(value, default=_orjson_default)
+            continue
+        row_separator = b'[\n    '
+        for row in value:
+            yield row_separator + orjson.dumps(row, default=_orjson_default)
+            row_separator = b',\n    '
+        yield b'[]' if row_separator == b'[\n    ' else b'\n  ]'
+    yield b'\n}\n'
+
+def _stream_export_json(config: ExportConfiguration, chunk_size: int = 64 * 1024):
+    """Yield the export document in chunk_size pieces using a session owned by the stream.
+
+    The request's session is closed before a streaming body is sent, so the
+    stream opens its own and closes it once the last row is written.
+    """
+    db = SessionLocal()
+    try:
+        buffer = bytearray()
+        for chunk in _export_json_chunks(_generate_export_data(config, db)):
+            buffer += chunk
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        db.close()
+
 def _estimate_export_size(
     lab_results_count: int, patients_count: int, labs_count: int,
     providers_count: int, panels_count: int, units_count: int,
-    pdf_files_count: int, include_pdfs: bool
+    pdf_files_count: int, include_pdfs: bool,
+    lab_result_size: float = 500, pdf_file_size: float = 2 * 1024 * 1024
 ) -> str:
-    """Estimate the size of the export."""
+    """Estimate the size of the export from per-row and per-PDF average sizes."""
     # Rough estimates (in bytes)
     json_size = (
-        lab_results_count * 500 +  # ~500 bytes per lab result
+        lab_results_count * lab_result_size +
         patients_count * 100 +     # ~100 bytes per patient
         labs_count * 200 +         # ~200 bytes per lab
         providers_count * 100 +    # ~100 bytes per provider
@@ -637,118 +832,189 @@ def _estimate_export_size(
     # Add PDF size estimate if included
     total_size = json_size
     if include_pdfs:
-        pdf_size = pdf_files_count * 2 * 1024 * 1024  # Assume ~2MB per PDF
-        total_size += pdf_size
-    
-    # Convert to human readable
-    if total_size < 1024:
-        return f"{total_size} bytes"
-    elif total_size < 1024 * 1024:
-        return f"{total_size / 1024:.1f} KB"
-    elif total_size < 1024 * 1024 * 1024:
-        return f"{total_size / (1024 * 1024):.1f} MB"
-    else:
-        return f"{total_size / (1024 * 1024 * 1024):.1f} GB"
+        total_size += pdf_files_count * pdf_file_size
+    
+    return _human_size(int(total_size))
+
+def _sample_lab_result_size(db: Session) -> float:
+    """Average exported size of a lab result, sampled from up to 1000 rows."""
+    sample = select(
+        LabResultModel.result_text, LabResultModel.notes
+    ).limit(1000).subquery()
+    variable_size = db.execute(select(func.avg(
+        func.coalesce(func.length(sample.c.result_text), 0) +
+        func.coalesce(func.length(sample.c.notes), 0)
+    ))).scalar()
+    # ~400 bytes of keys, names, numbers and dates per row plus its free-text fields
+    return 400 + float(variable_size or 0)
+
+def _sample_pdf_files(pdf_dir: Path, sample_size: int = 10) -> tuple:
+    """Count PDFs in pdf_dir and average the sizes of the first sample_size of them."""
+    count = 0
+    sampled_bytes = 0
+    for entry in _iter_pdfs(pdf_dir):
+        if count < sample_size:
+            try:
+                sampled_bytes += entry.stat().st_size
+            except OSError:
+                pass
+        count += 1
+    sampled = min(count, sample_size)
+    return count, (sampled_bytes / sampled if sampled else 2 * 1024 * 1024)
+
+_SIZE_UNITS = ("bytes", "KB", "MB", "GB")
+
+@lru_cache(maxsize=1024)
+def _human_size(size: int) -> str:
+    """Format a byte count as a human readable string."""
+    # Each unit step is 10 bits; bit_length() picks the unit without a comparison ladder
+    unit = min(max(size.bit_length() - 1, 0) // 10, 3)
+    if unit == 0:
+        return f"{size} bytes"
+    return f"{size / (1 << (10 * unit)):.1f} {_SIZE_UNITS[unit]}"
+
+# Column getters for the export converters; created_at is not tracked on these models
+_patient_fields = attrgetter("id", "name", "date_of_birth", "gender")
+_provider_fields = attrgetter("id", "name", "specialty")
+_named_fields = attrgetter("id", "name")
+_lab_fields = attrgetter(
+    "id", "name", "panel_id", "panel", "unit_id", "unit",
+    "ref_low", "ref_high", "ref_value", "ref_type"
+)
 
 def _patient_to_dict(patient: PatientModel) -> dict:
     """Convert patient model to dictionary."""
+    patient_id, name, date_of_birth, gender = _patient_fields(patient)
     return {
-        "id": patient.id,
-        "name": patient.name,
-        "date_of_birth": patient.date_of_birth.isoformat() if patient.date_of_birth else None,
-        "gender": patient.gender
+        "id": patient_id,
+        "name": name,
+        "date_of_birth": date_of_birth,
+        "gender": gender
     }
 
 def _provider_to_dict(provider: ProviderModel) -> dict:
     """Convert provider model to dictionary."""
+    provider_id, name, specialty = _provider_fields(provider)
     return {
-        "id": provider.id,
-        "name": provider.name,
-        "specialty": provider.specialty,
-        "created_at": getattr(provider, 'created_at', None).isoformat() if hasattr(provider, 'created_at') and getattr(provider, 'created_at') else None
+        "id": provider_id,
+        "name": name,
+        "specialty": specialty,
+        "created_at": None
     }
 
 def _panel_to_dict(panel: PanelModel) -> dict:
     """Convert panel model to dictionary."""
+    panel_id, name = _named_fields(panel)
     return {
-        "id": panel.id,
-        "name": panel.name,
-        "created_at": getattr(panel, 'created_at', None).isoformat() if hasattr(panel, 'created_at') and getattr(panel, 'created_at') else None
+        "id": panel_id,
+        "name": name,
+        "created_at": None
     }
 
 def _unit_to_dict(unit: UnitModel) -> dict:
     """Convert unit model to dictionary."""
+    unit_id, name = _named_fields(unit)
     return {
-        "id": unit.id,
-        "name": unit.name,
-        "created_at": getattr(unit, 'created_at', None).isoformat() if hasattr(unit, 'created_at') and getattr(unit, 'created_at') else None
+        "id": unit_id,
+        "name": name,
+        "created_at": None
     }
 
 def _lab_to_dict(lab: LabModel) -> dict:
     """Convert lab model to dictionary."""
+    (
+        lab_id, name, panel_id, panel, unit_id, unit,
+        ref_low, ref_high, ref_value, ref_type
+    ) = _lab_fields(lab)
     return {
-        "id": lab.id,
-        "name": lab.name,
-        "panel_id": lab.panel_id,
-        "panel_name": lab.panel.name if lab.panel else None,
-        "unit_id": lab.unit_id,
-        "unit_name": lab.unit.name if lab.unit else None,
-        "ref_low": lab.ref_low,
-        "ref_high": lab.ref_high,
-        "ref_value": lab.ref_value,
-        "ref_type": lab.ref_type,
-        "created_at": getattr(lab, 'created_at', None).isoformat() if hasattr(lab, 'created_at') and getattr(lab, 'created_at') else None
+        "id": lab_id,
+        "name": name,
+        "panel_id": panel_id,
+        "panel_name": panel.name if panel else None,
+        "unit_id": unit_id,
+        "unit_name": unit.name if unit else None,
+        "ref_low": ref_low,
+        "ref_high": ref_high,
+        "ref_value": ref_value,
+        "ref_type": ref_type,
+        "created_at": None
     }
 
-def _lab_result_to_dict(lab_result: LabResultModel) -> dict:
-    """Convert lab result model to dictionary."""
-    return {
-        "id": lab_result.id,
-        "patient_id": lab_result.patient_id,
-        "patient_name": lab_result.patient.name if lab_result.patient else None,
-        "lab_id": lab_result.lab_id,
-        "lab_name": lab_result.lab.name if lab_result.lab else None,
-        "provider_id": lab_result.provider_id,
-        "provider_name": lab_result.provider.name if lab_result.provider else None,
-        "result": lab_result.result,
-        "result_text": lab_result.result_text,
-        "date_collected": lab_result.date_collected.isoformat() if lab_result.date_collected else None,
-        "notes": lab_result.notes,
-        "created_at": getattr(lab_result, 'created_at', None).isoformat() if hasattr(lab_result, 'created_at') and getattr(lab_result, 'created_at') else None,
-        "lab_details": {
-            "unit_name": lab_result.lab.unit.name if lab_result.lab and lab_result.lab.unit else None,
-            "panel_name": lab_result.lab.panel.name if lab_result.lab and lab_result.lab.panel else None,
-            "reference_range": {
-                "low": lab_result.lab.ref_low if lab_result.lab else None,
-                "high": lab_result.lab.ref_high if lab_result.lab else None,
-                "value": lab_result.lab.ref_value if lab_result.lab else None,
-                "type": lab_result.lab.ref_type if lab_result.lab else None
-            }
-        }
-    }
+@dataclass(slots=True)
+class _ReferenceRangeExport:
+    """Reference range of an exported lab result."""
+    low: Optional[float]
+    high: Optional[float]
+    value: Optional[float]
+    type: Optional[str]
+
+@dataclass(slots=True)
+class _LabDetailsExport:
+    """Lab details of an exported lab result."""
+    unit_name: Optional[str]
+    panel_name: Optional[str]
+    reference_range: _ReferenceRangeExport
+
+@dataclass(slots=True)
+class _LabResultExport:
+    """Exported lab result; orjson serializes it in field order, matching the v1.0 layout."""
+    id: int
+    patient_id: Optional[int]
+    patient_name: Optional[str]
+    lab_id: Optional[int]
+    lab_name: Optional[str]
+    provider_id: Optional[int]
+    provider_name: Optional[str]
+    result: Optional[float]
+    result_text: Optional[str]
+    date_collected: Optional[date]
+    notes: Optional[str]
+    created_at: None
+    lab_details: _LabDetailsExport
+
+def _lab_result_to_export(row) -> _LabResultExport:
+    """Convert a lab result export row (see _generate_export_data) to its export record."""
+    (
+        result_id, patient_id, patient_name, lab_id, lab_name, provider_id, provider_name,
+        result, result_text, date_collected, notes, unit_name, panel_name,
+        ref_low, ref_high, ref_value, ref_type
+    ) = row
+    return _LabResultExport(
+        result_id, patient_id, patient_name, lab_id, lab_name, provider_id, provider_name,
+        result, result_text, date_collected, notes, None,
+        _LabDetailsExport(unit_name, panel_name, _ReferenceRangeExport(ref_low, ref_high, ref_value, ref_type))
+    )
+
+def _find_existing_names(db: Session, name_column, names: set) -> set:
+    """Return existing names in name_column's table that match names, ignoring case."""
+    lowered = list({name.lower() for name in names})
+    existing = set()
+    # Chunk the IN list to stay under SQLite's bound-parameter limit
+    for i in range(0, len(lowered), 900):
+        existing.update(db.execute(
+            select(name_column).where(func.lower(name_column).in_(lowered[i:i + 900]))
+        ).scalars())
+    return existing
 
 def _check_import_conflicts(export_data: dict, db: Session) -> List[str]:
     """Check for potential conflicts when importing data."""
     conflicts = []
     
     # Check for existing patients with same names
-    existing_patients = {p.name for p in db.query(PatientModel).all()}
     import_patients = {p['name'] for p in export_data.get('patients', [])}
-    patient_conflicts = existing_patients.intersection(import_patients)
+    patient_conflicts = _find_existing_names(db, PatientModel.name, import_patients)
     if patient_conflicts:
         conflicts.extend([f"Patient already exists: {name}" for name in patient_conflicts])
     
     # Check for existing providers with same names
-    existing_providers = {p.name for p in db.query(ProviderModel).all()}
     import_providers = {p['name'] for p in export_data.get('providers', [])}
-    provider_conflicts = existing_providers.intersection(import_providers)
+    provider_conflicts = _find_existing_names(db, ProviderModel.name, import_providers)
     if provider_conflicts:
         conflicts.extend([f"Provider already exists: {name}" for name in provider_conflicts])
     
     # Check for existing panels/units/labs
-    existing_panels = {p.name for p in db.query(PanelModel).all()}
     import_panels = {p['name'] for p in export_data.get('panels', [])}
-    panel_conflicts = existing_panels.intersection(import_panels)
+    panel_conflicts = _find_existing_names(db, PanelModel.name, import_panels)
     if panel_conflicts:
         conflicts.extend([f"Panel already exists: {name}" for name in panel_conflicts])
     
@@ -774,36 +1040,137 @@ def _validate_import_data(export_data: dict):
     if not isinstance(export_data['lab_results'], list):
         raise HTTPException(status_code=400, detail="Invalid lab results data format")
 
-def _perform_data_import(export_data: dict, pdf_files: dict, merge_data: bool, start_from_scratch: bool, db: Session) -> dict:
-    """Perform the actual data import operation."""
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: Optional[str]) -> Optional[date]:
+    """Parse the date part of an exported ISO date/datetime string; many rows share a date."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.fromisoformat(value).date()
+
+def _write_pdf(open_pdf, pdf_path: Path):
+    """Copy one PDF archive member to pdf_path in 1 MB chunks."""
+    with open_pdf() as src, open(pdf_path, 'wb') as f:
+        shutil.copyfileobj(src, f, 1024 * 1024)
+
+def _existing_name_ids(db: Session, model, names: set, ignore_case: bool = False) -> dict:
+    """Map each of names that already exists in model's table to its row ID.
+
+    With ignore_case, names match regardless of case (as the conflict preview does)
+    and the keys are lowercased; the lowest ID wins when several rows share a name.
+    """
+    name_column = func.lower(model.name) if ignore_case else model.name
+    names = list({name.lower() for name in names} if ignore_case else names)
+    existing = {}
+    # Chunk the IN list to stay under SQLite's bound-parameter limit
+    for i in range(0, len(names), 900):
+        for name, row_id in db.execute(
+            select(name_column, model.id).where(name_column.in_(names[i:i + 900])).order_by(model.id)
+        ):
+            existing.setdefault(name, row_id)
+    return existing
+
+def _upsert_named_rows(db: Session, model, items: list, to_row, id_map: dict) -> tuple:
+    """Merge-import entities whose name is UNIQUE with INSERT OR IGNORE and one ID lookup.
+
+    SQLite decides which names are new, so no existence query is needed up front.
+    Returns the number of inserted rows and the number of conflicts resolved.
+    """
+    first_by_name = {}
+    for item in items:
+        first_by_name.setdefault(item['name'], item)
+    
+    inserted = 0
+    if first_by_name:
+        inserted = db.execute(
+            sqlite_insert(model.__table__).on_conflict_do_nothing(index_elements=['name']),
+            [to_row(item) for item in first_by_name.values()]
+        ).rowcount
+    
+    ids_by_name = _existing_name_ids(db, model, first_by_name.keys())
+    for item in items:
+        id_map[item['id']] = ids_by_name[item['name']]
+    
+    return inserted, len(items) - inserted
+
+def _import_named_rows(db: Session, model, items: list, to_row, merge_data: bool, id_map: dict) -> tuple:
+    """Bulk insert named entities from an export, filling id_map with export ID -> database ID.
+
+    When merging, a name that already exists (in the database or earlier in the
+    same import, ignoring case) is mapped to that row instead of inserted. Returns
+    the number of inserted rows and the number of conflicts resolved.
+    """
+    if merge_data and model.__table__.c.name.unique and db.get_bind().dialect.name == "sqlite":
+        return _upsert_named_rows(db, model, items, to_row, id_map)
+    
+    existing = _existing_name_ids(db, model, {item['name'] for item in items}, ignore_case=True) if merge_data else {}
+    
+    new_rows = []
+    new_row_by_name = {}
+    pending = []  # (export ID, row dict) resolved once the INSERT returns IDs
+    conflicts = 0
+    for item in items:
+        name = item['name'].lower()
+        if merge_data and name in existing:
+            id_map[item['id']] = existing[name]
+            conflicts += 1
+        elif merge_data and name in new_row_by_name:
+            pending.append((item['id'], new_row_by_name[name]))
+            conflicts += 1
+        else:
+            row = to_row(item)
+            new_rows.append(row)
+            new_row_by_name[name] = row
+            pending.append((item['id'], row))
+    
+    if new_rows:
+        new_ids = db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            new_rows
+        ).scalars().all()
+        for row, new_id in zip(new_rows, new_ids):
+            row['id'] = new_id
+    for export_id, row in pending:
+        id_map[export_id] = row['id']
+    
+    return len(new_rows), conflicts
+
+def _perform_data_import(export_data: dict, pdf_files: dict, merge_data: bool, start_from_scratch: bool, db: Session, background_tasks: BackgroundTasks) -> dict:
+    """Perform the actual data import operation.
+
+    pdf_files maps each PDF filename to a callable that opens its archive member.
+    """
     imported_records = 0
     imported_pdfs = 0
     conflicts_resolved = 0
     warnings = []
+    pdf_dir = Path("/app/data/uploads/pdfs")
+    trash_dir = None
     
     try:
         # If not merging, clear existing data
         if not merge_data or start_from_scratch:
-            # Delete all lab results first (foreign key constraints)
-            db.query(LabResultModel).delete()
-            db.query(LabModel).delete()
-            db.query(PanelModel).delete()
-            db.query(UnitModel).delete()
-            db.query(ProviderModel).delete()
+            # Delete all lab results first (foreign key constraints); nothing is loaded to synchronize
+            db.query(LabResultModel).delete(synchronize_session=False)
+            db.query(LabModel).delete(synchronize_session=False)
+            db.query(PanelModel).delete(synchronize_session=False)
+            db.query(UnitModel).delete(synchronize_session=False)
+            db.query(ProviderModel).delete(synchronize_session=False)
             
             # For start from scratch, delete ALL patients
             # For regular replace mode, keep default patient
             if start_from_scratch:
-                db.query(PatientModel).delete()
-                # Also clear PDF files directory
-                pdf_dir = Path("/app/data/uploads/pdfs")
+                db.query(PatientModel).delete(synchronize_session=False)
+                # Also clear PDF files directory: swap it aside atomically; the old
+                # contents are deleted after the commit, or restored if the import fails
                 if pdf_dir.exists():
-                    shutil.rmtree(pdf_dir)
+                    trash_dir = pdf_dir.with_name(f"pdfs.trash.{uuid4().hex}")
+                    os.replace(pdf_dir, trash_dir)
                     pdf_dir.mkdir(parents=True, exist_ok=True)
             else:
-                db.query(PatientModel).filter(PatientModel.id != 1).delete()
-            
-            db.commit()
+                db.query(PatientModel).filter(PatientModel.id != 1).delete(synchronize_session=False)
         
         # Create ID mapping for imported entities
         patient_id_map = {}
@@ -812,87 +1179,45 @@ def _perform_data_import(export_data: dict, pdf_files: dict, merge_data: bool, s
         unit_id_map = {}
         lab_id_map = {}
         
-        # Import patients
-        for patient_data in export_data.get('patients', []):
-            existing_patient = db.query(PatientModel).filter(PatientModel.name == patient_data['name']).first()
-            if existing_patient and merge_data:
-                patient_id_map[patient_data['id']] = existing_patient.id
-                conflicts_resolved += 1
-            else:
-                new_patient = PatientModel(
-                    name=patient_data['name'],
-                    date_of_birth=datetime.fromisoformat(patient_data['date_of_birth']).date() if patient_data.get('date_of_birth') else None,
-                    gender=patient_data.get('gender')
-                )
-                db.add(new_patient)
-                db.flush()
-                patient_id_map[patient_data['id']] = new_patient.id
-                imported_records += 1
-        
-        # Import providers
-        for provider_data in export_data.get('providers', []):
-            existing_provider = db.query(ProviderModel).filter(ProviderModel.name == provider_data['name']).first()
-            if existing_provider and merge_data:
-                provider_id_map[provider_data['id']] = existing_provider.id
-                conflicts_resolved += 1
-            else:
-                new_provider = ProviderModel(
-                    name=provider_data['name'],
-                    specialty=provider_data.get('specialty')
+        # Import each entity type with one existence query and one bulk INSERT
+        for model, items, to_row, id_map in (
+            (PatientModel, export_data.get('patients', []), lambda patient_data: {
+                'name': patient_data['name'],
+                'date_of_birth': _parse_iso_date(patient_data.get('date_of_birth')),
+                'gender': patient_data.get('gender')
+            }, patient_id_map),
+            (ProviderModel, export_data.get('providers', []), lambda provider_data: {
+                'name': provider_data['name'],
+                'specialty': provider_data.get('specialty')
+            }, provider_id_map),
+            (PanelModel, export_data.get('panels', []), lambda panel_data: {
+                'name': panel_data['name']
+            }, panel_id_map),
+            (UnitModel, export_data.get('units', []), lambda unit_data: {
+                'name': unit_data['name']
+            }, unit_id_map),
+            # Labs come last so the panel and unit maps are complete
+            (LabModel, export_data.get('labs', []), lambda lab_data: {
+                'name': lab_data['name'],
+                'panel_id': panel_id_map.get(lab_data.get('panel_id')),
+                'unit_id': unit_id_map.get(lab_data.get('unit_id')),
+                'ref_low': lab_data.get('ref_low'),
+                'ref_high': lab_data.get('ref_high'),
+                'ref_value': lab_data.get('ref_value'),
+                'ref_type': lab_data.get('ref_type'),
+                # Bulk inserts skip ORM events, so format the stored reference range here
+                'reference_range': format_reference_range(
+                    lab_data.get('ref_type'), lab_data.get('ref_low'),
+                    lab_data.get('ref_high'), lab_data.get('ref_value')
                 )
-                db.add(new_provider)
-                db.flush()
-                provider_id_map[provider_data['id']] = new_provider.id
-                imported_records += 1
-        
-        # Import panels
-        for panel_data in export_data.get('panels', []):
-            existing_panel = db.query(PanelModel).filter(PanelModel.name == panel_data['name']).first()
-            if existing_panel and merge_data:
-                panel_id_map[panel_data['id']] = existing_panel.id
-                conflicts_resolved += 1
-            else:
-                new_panel = PanelModel(name=panel_data['name'])
-                db.add(new_panel)
-                db.flush()
-                panel_id_map[panel_data['id']] = new_panel.id
-                imported_records += 1
-        
-        # Import units
-        for unit_data in export_data.get('units', []):
-            existing_unit = db.query(UnitModel).filter(UnitModel.name == unit_data['name']).first()
-            if existing_unit and merge_data:
-                unit_id_map[unit_data['id']] = existing_unit.id
-                conflicts_resolved += 1
-            else:
-                new_unit = UnitModel(name=unit_data['name'])
-                db.add(new_unit)
-                db.flush()
-                unit_id_map[unit_data['id']] = new_unit.id
-                imported_records += 1
-        
-        # Import labs
-        for lab_data in export_data.get('labs', []):
-            existing_lab = db.query(LabModel).filter(LabModel.name == lab_data['name']).first()
-            if existing_lab and merge_data:
-                lab_id_map[lab_data['id']] = existing_lab.id
-                conflicts_resolved += 1
-            else:
-                new_lab = LabModel(
-                    name=lab_data['name'],
-                    panel_id=panel_id_map.get(lab_data.get('panel_id')),
-                    unit_id=unit_id_map.get(lab_data.get('unit_id')),
-                    ref_low=lab_data.get('ref_low'),
-                    ref_high=lab_data.get('ref_high'),
-                    ref_value=lab_data.get('ref_value'),
-                    ref_type=lab_data.get('ref_type')
-                )
-                db.add(new_lab)
-                db.flush()
-                lab_id_map[lab_data['id']] = new_lab.id
-                imported_records += 1
+            }, lab_id_map),
+        ):
+            imported, conflicts = _import_named_rows(db, model, items, to_row, merge_data, id_map)
+            imported_records += imported
+            conflicts_resolved += conflicts
         
         # Import lab results
+        result_rows = []
         for result_data in export_data.get('lab_results', []):
             # Skip if we can't map the required IDs
             if (result_data.get('patient_id') not in patient_id_map or 
@@ -900,38 +1225,45 @@ def _perform_data_import(export_data: dict, pdf_files: dict, merge_data: bool, s
                 warnings.append(f"Skipped lab result due to missing patient or lab mapping")
                 continue
                 
-            new_result = LabResultModel(
-                patient_id=patient_id_map[result_data['patient_id']],
-                lab_id=lab_id_map[result_data['lab_id']],
-                provider_id=provider_id_map.get(result_data.get('provider_id')),
-                result=result_data.get('result'),
-                result_text=result_data.get('result_text'),
-                date_collected=datetime.fromisoformat(result_data['date_collected']).date() if result_data.get('date_collected') else None,
-                notes=result_data.get('notes')
-            )
-            db.add(new_result)
-            imported_records += 1
+            result_rows.append({
+                'patient_id': patient_id_map[result_data['patient_id']],
+                'lab_id': lab_id_map[result_data['lab_id']],
+                'provider_id': provider_id_map.get(result_data.get('provider_id')),
+                'result': result_data.get('result'),
+                'result_text': result_data.get('result_text'),
+                'date_collected': _parse_iso_date(result_data.get('date_collected')),
+                'notes': result_data.get('notes')
+            })
+        if result_rows:
+            db.execute(insert(LabResultModel), result_rows)
+            imported_records += len(result_rows)
         
         # Import PDF files
         if pdf_files:
-            pdf_dir = Path("/app/data/uploads/pdfs")
             pdf_dir.mkdir(parents=True, exist_ok=True)
             
-            for filename, content in pdf_files.items():
+            pdf_writes = []
+            for filename, open_pdf in pdf_files.items():
                 pdf_path = pdf_dir / filename
                 # Only write if file doesn't exist or we're not merging
                 if not pdf_path.exists() or not merge_data:
-                    with open(pdf_path, 'wb') as f:
-                        f.write(content)
-                    imported_pdfs += 1
+                    pdf_writes.append((open_pdf, pdf_path))
                 else:
                     conflicts_resolved += 1
+            
+            # Extract in parallel; zipfile serializes archive reads, while decompression and writes overlap
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for _ in executor.map(_write_pdf, *zip(*pdf_writes)):
+                    imported_pdfs += 1
         
         # Commit all changes
         db.commit()
         
+        # Delete the swapped-out PDFs after the response is sent
+        if trash_dir is not None:
+            background_tasks.add_task(shutil.rmtree, trash_dir, ignore_errors=True)
+        
         # Clear cache after import
-        from ..utils.cache import api_cache
         api_cache.clear()
         
         return {
@@ -943,4 +1275,8 @@ def _perform_data_import(export_data: dict, pdf_files: dict, merge_data: bool, s
         
     except Exception as e:
         db.rollback()
+        # The rolled-back rows still reference the old PDFs, so put them back
+        if trash_dir is not None:
+            shutil.rmtree(pdf_dir, ignore_errors=True)
+            os.replace(trash_dir, pdf_dir)
         raise e
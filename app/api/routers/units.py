@@ -1,17 +1,18 @@
 """Unit management routes."""
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..models import Unit as UnitModel
+from ..models import Lab as LabModel, Unit as UnitModel
 from ..schemas import UnitCreate
 
 router = APIRouter()
 
 def _get_unit_or_404(unit_id: int, db: Session) -> UnitModel:
     """Get unit by ID or raise 404."""
-    unit = db.query(UnitModel).filter(UnitModel.id == unit_id).first()
+    unit = db.get(UnitModel, unit_id)
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
     return unit
@@ -19,10 +20,14 @@ def _get_unit_or_404(unit_id: int, db: Session) -> UnitModel:
 @router.get("/")
 def get_units(db: Session = Depends(get_db)):
     """Get all measurement units in the system."""
-    units = db.query(UnitModel).options(
-        joinedload(UnitModel.labs)
-    ).all()
-    return [unit.to_dict() for unit in units]
+    # Count labs per unit in SQL instead of loading every lab row
+    units = (
+        db.query(UnitModel, func.count(LabModel.id))
+        .outerjoin(LabModel, LabModel.unit_id == UnitModel.id)
+        .group_by(UnitModel.id)
+        .all()
+    )
+    return [unit.to_dict(lab_count=lab_count) for unit, lab_count in units]
 
 @router.post("/")
 def create_unit(unit: UnitCreate, db: Session = Depends(get_db)):
@@ -1,8 +1,30 @@
 """Pydantic schemas for API request/response models."""
 
 from datetime import datetime, date
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Any, ClassVar, Literal
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, computed_field
+
+
+class ORMResponse(BaseModel):
+    """Response schema read from ORM attributes, or built from trusted rows without validation."""
+    # Validators are built on first use; see the rebuilds at the end of this module
+    model_config = ConfigDict(from_attributes=True, defer_build=True)
+    nested_schemas: ClassVar[dict[str, type]] = {}
+
+    @classmethod
+    def from_orm_fast(cls, obj):
+        """Build from an ORM object with model_construct, constructing nested schemas the same way.
+
+        Only for rows loaded from the database; untrusted input must use model_validate.
+        """
+        data = {}
+        for name in cls.model_fields:
+            value = getattr(obj, name, None)
+            nested = cls.nested_schemas.get(name)
+            if nested is not None and value is not None:
+                value = nested.from_orm_fast(value)
+            data[name] = value
+        return cls.model_construct(**data)
 
 
 class PanelBase(BaseModel):
@@ -14,45 +36,43 @@ class PanelCreate(PanelBase):
     pass
 
 
-class Panel(PanelBase):
+class Panel(PanelBase, ORMResponse):
     """Panel response schema with database ID."""
     id: int
 
-    class Config:
-        from_attributes = True
-
 
 class PatientBase(BaseModel):
     name: str
-    date_of_birth: Optional[date] = None
-    gender: Optional[str] = None
+    date_of_birth: date | None = None
+    gender: str | None = None
 
 
 class PatientCreate(PatientBase):
     pass
 
 
-class Patient(PatientBase):
+class Patient(PatientBase, ORMResponse):
     id: int
 
-    class Config:
-        from_attributes = True
-
 
 class ProviderBase(BaseModel):
     name: str
-    specialty: Optional[str] = None
+    specialty: str | None = None
 
 
 class ProviderCreate(ProviderBase):
     pass
 
 
-class Provider(ProviderBase):
+class Provider(ProviderBase, ORMResponse):
     id: int
 
-    class Config:
-        from_attributes = True
+
+class ProviderRead(Provider):
+    """Provider list schema with result statistics."""
+    result_count: int
+    patient_count: int
+    recent_results_count: int
 
 
 class UnitBase(BaseModel):
@@ -63,21 +83,18 @@ class UnitCreate(UnitBase):
     pass
 
 
-class Unit(UnitBase):
+class Unit(UnitBase, ORMResponse):
     id: int
 
-    class Config:
-        from_attributes = True
-
 
 class LabBase(BaseModel):
     name: str
     panel_id: int
-    unit_id: Optional[int] = None
-    ref_low: Optional[float] = None
-    ref_high: Optional[float] = None
-    ref_type: Optional[str] = "range"
-    ref_value: Optional[float] = None
+    unit_id: int | None = None
+    ref_low: float | None = None
+    ref_high: float | None = None
+    ref_type: str | None = "range"
+    ref_value: float | None = None
 
 
 class LabCreate(LabBase):
@@ -85,13 +102,11 @@ class LabCreate(LabBase):
 
 
 
-class Lab(LabBase):
+class Lab(LabBase, ORMResponse):
     id: int
-    panel: Optional[Panel] = None
-    unit: Optional[Unit] = None
-
-    class Config:
-        from_attributes = True
+    panel: Panel | None = None
+    unit: Unit | None = None
+    nested_schemas: ClassVar[dict[str, type]] = {"panel": Panel, "unit": Unit}
 
 
 class LabResultBase(BaseModel):
@@ -99,18 +114,12 @@ class LabResultBase(BaseModel):
     lab_id: int
     patient_id: int
     provider_id: int
-    result: Optional[float] = None
-    result_text: Optional[str] = None
+    result: float | None = None
+    result_text: str | None = None
     date_collected: datetime
-    notes: Optional[str] = None
-    pdf_import_id: Optional[str] = None
-    @field_validator('pdf_import_id', mode='before')
-    @classmethod
-    def convert_pdf_import_id_to_string(cls, v):
-        """Convert pdf_import_id to string if it's not already"""
-        if v is not None:
-            return str(v)
-        return v
+    notes: str | None = None
+    # Import log IDs may arrive as numbers; pydantic-core coerces them without a Python validator
+    pdf_import_id: str | None = Field(None, coerce_numbers_to_str=True)
 
 
 class LabResultCreate(LabResultBase):
@@ -118,15 +127,12 @@ class LabResultCreate(LabResultBase):
 
 
 
-class LabResult(LabResultBase):
+class LabResult(LabResultBase, ORMResponse):
     """Lab result response schema."""
     id: int
-    status: Optional[str] = None
-    is_normal: Optional[bool] = None
-    reference_range: Optional[str] = None
-
-    class Config:
-        from_attributes = True
+    status: str | None = None
+    is_normal: bool | None = None
+    reference_range: str | None = None
 
 
 class LabResultWithDetails(LabResult):
@@ -134,58 +140,148 @@ class LabResultWithDetails(LabResult):
     lab: Lab
     patient: Patient
     provider: Provider
+    nested_schemas: ClassVar[dict[str, type]] = {"lab": Lab, "patient": Patient, "provider": Provider}
+
+
+
+class PDFImportCounts(BaseModel):
+    """APIResponse payload for a confirmed PDF import."""
+    kind: Literal["pdf_import"] = "pdf_import"
+    imported_count: int
+    skipped_count: int
+
 
-    class Config:
-        from_attributes = True
+class PDFBatchImportCounts(BaseModel):
+    """APIResponse payload for a confirmed batch of PDF imports."""
+    kind: Literal["pdf_batch_import"] = "pdf_batch_import"
+    batch_id: str
+    total_imported: int
+    total_skipped: int
+    failed_count: int
+    failed_files: list[str] = []
 
 
+# Payloads are told apart by their kind tag, so validation dispatches straight to one schema
+APIResponseData = Annotated[PDFImportCounts | PDFBatchImportCounts, Field(discriminator="kind")]
+
 
 class APIResponse(BaseModel):
     """Standard API response schema."""
     success: bool
     message: str
-    data: Optional[Dict[str, Any]] = None
+    data: APIResponseData | None = None
+
 
 
+class PDFPreviewTest(BaseModel):
+    """Parsed test in a PDF import preview, with its lab match and review notes."""
+    name: str | None = None
+    result: str | float | None = None
+    result_text: str | None = None
+    unit: str | None = None
+    reference_range: dict[str, Any] | str | None = None
+    is_numeric: bool = False
+    is_qualitative: bool = False
+    numeric_value: float | None = None
+    matched_lab_id: int | None = None
+    matched_lab_name: str | None = None
+    confidence: float = 0.0
+    warnings: list[str] | None = None
+    issues: list[str] | None = None
+
 
 class PDFImportPreview(BaseModel):
     """PDF import preview response schema."""
     filename: str
-    date_collected: Optional[str] = None
+    date_collected: str | None = None
     total_tests_found: int
-    importable_tests: List[Dict[str, Any]] = []
-    problematic_tests: List[Dict[str, Any]] = []
-    matched_provider: Optional[Provider] = None
-    import_id: Optional[str] = None
-    duplicate_warning: Optional[Dict[str, Any]] = None
+    importable_tests: list[PDFPreviewTest] = []
+    problematic_tests: list[PDFPreviewTest] = []
+    matched_provider: Provider | None = None
+    import_id: str | None = None
+    duplicate_warning: dict[str, Any] | None = None
+
+
+class PDFImportRead(ORMResponse):
+    """PDF import log response schema."""
+    id: int
+    filename: str
+    file_hash: str | None = None
+    batch_id: str | None = None
+    total_tests_found: int | None = None
+    tests_imported: int | None = None
+    tests_skipped: int | None = None
+    date_collected: str | None = None
+    provider_name: str | None = None
+    provider_id: int | None = None
+    status: str | None = None
+    error_message: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    file_path: str
+    parsed_data: str | None = None
 
 
 class PDFImportConfirm(BaseModel):
     """PDF import confirmation schema."""
     import_id: str
-    selected_tests: List[int]
-    provider_id: Optional[int] = None
+    selected_tests: list[int] = Field(..., max_length=1000, description="Indices of parsed tests to import")
+    provider_id: int | None = None
     patient_id: int = 1
-    manual_date: Optional[str] = None
+    manual_date: str | None = None
 
 
-class PaginatedLabResults(BaseModel):
+class LabResultListRow(BaseModel):
+    """Flat lab result row for list endpoints, with related names inlined."""
+    id: int
+    result: float | None = None
+    result_text: str | None = None
+    lab_name: str
+    panel_name: str | None = None
+    unit_name: str | None = None
+    patient_name: str
+    provider_name: str
+    date_collected: str = Field(..., description="Collection timestamp, ISO 8601 without fractional seconds")
+    status: str | None = None
+    is_normal: bool | None = None
+
+
+def pagination_flags(skip: int, returned: int, page_size: int, total_count: int) -> dict:
+    """Page count and next/previous flags for a page of returned rows starting at offset skip."""
+    return {
+        "total_pages": (total_count + page_size - 1) // page_size,
+        "has_next": skip + returned < total_count,
+        "has_prev": skip > 0
+    }
+
+
+class PaginatedLabResults(ORMResponse):
     """
     Paginated lab results response schema.
     
     Provides both the results data and pagination metadata
     for improved frontend pagination handling.
     """
-    results: List[LabResultWithDetails]
+    results: list[LabResultListRow]
     total_count: int = Field(..., description="Total number of results matching filters")
     page: int = Field(..., description="Current page number (1-based)")
     page_size: int = Field(..., description="Number of results per page")
-    total_pages: int = Field(..., description="Total number of pages")
-    has_next: bool = Field(..., description="Whether there are more pages available")
-    has_prev: bool = Field(..., description="Whether there are previous pages available")
-    
-    class Config:
-        from_attributes = True
+    skip: int = Field(0, description="Number of results skipped before this page")
+
+    @computed_field(description="Total number of pages")
+    @property
+    def total_pages(self) -> int:
+        return pagination_flags(self.skip, len(self.results), self.page_size, self.total_count)["total_pages"]
+
+    @computed_field(description="Whether there are more pages available")
+    @property
+    def has_next(self) -> bool:
+        return pagination_flags(self.skip, len(self.results), self.page_size, self.total_count)["has_next"]
+
+    @computed_field(description="Whether there are previous pages available")
+    @property
+    def has_prev(self) -> bool:
+        return pagination_flags(self.skip, len(self.results), self.page_size, self.total_count)["has_prev"]
 
 
 # Settings Schemas
@@ -194,29 +290,31 @@ class UserSettingsBase(BaseModel):
     """Base schema for user settings."""
     sidebar_open: bool = Field(True, description="Whether sidebar is open")
     dark_mode: bool = Field(False, description="Whether dark mode is enabled")
+    date_format: str = Field("MM/DD/YYYY", description="Preferred date display format")
 
 
 class UserSettingsUpdate(BaseModel):
-    """Schema for updating user settings. Allows additional fields for extensibility."""
-    sidebar_open: Optional[bool] = Field(None, description="Whether sidebar is open")
-    dark_mode: Optional[bool] = Field(None, description="Whether dark mode is enabled")
+    """Schema for updating user settings."""
+    sidebar_open: bool | None = Field(None, description="Whether sidebar is open")
+    dark_mode: bool | None = Field(None, description="Whether dark mode is enabled")
+    date_format: str | None = Field(None, description="Preferred date display format")
 
-    class Config:
-        extra = "allow"  # Allow additional fields for extensibility
 
-
-class UserSettings(UserSettingsBase):
+class UserSettings(UserSettingsBase, ORMResponse):
     """
     Complete user settings schema with database fields.
     
     Used for API responses and includes auto-generated database fields.
-    Allows additional fields for extensibility.
     """
     id: int = Field(..., description="Settings ID")
     user_id: int = Field(..., description="User ID")
-    created_at: Optional[datetime] = Field(None, description="Creation timestamp")
-    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    created_at: datetime | None = Field(None, description="Creation timestamp")
+    updated_at: datetime | None = Field(None, description="Last update timestamp")
+
+
+# Build the schemas that serve responses up front; the rest stay deferred until used
+for _response_schema in (PaginatedLabResults, ProviderRead, PDFImportRead, UserSettings):
+    _response_schema.model_rebuild()
 
-    class Config:
-        from_attributes = True
-        extra = "allow"  # Allow additional fields for extensibility
+# Shared adapters keep their built validator and serializer across requests
+LAB_RESULT_ADAPTER = TypeAdapter(LabResultWithDetails)
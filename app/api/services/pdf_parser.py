@@ -1,13 +1,168 @@
 """PDF Parser Service for MyLabVault"""
 
+import asyncio
 import re
 import io
+import sys
+from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any
 import pypdf
 import pypdf.errors
 from dateutil import parser as date_parser
 import pdfplumber
 
+# Patterns for filtering out instructional text that shouldn't be parsed as test names or panels
+INSTRUCTIONAL_SKIP_PATTERNS = [
+    r'Comments?:',          # Comment fields
+    r'Interpretation:',     # Interpretation fields
+    r'Please note',         # Instructional text
+    r'Note:',              # Note fields
+    r'Important:',         # Important notices
+    r'Instructions?:',     # Instruction fields
+    r'Disclaimer:',        # Disclaimer text
+    r'Warning:',           # Warning text
+    r'Request Problem',    # Request/processing error text
+    r'^\s*Borderline\s+High\s*$',     # Result flag
+    r'^\s*Very\s+High\s*$',           # Result flag
+    r'^\s*High\s*$',                  # Result flag (standalone)
+    r'^\s*Low\s*$',                   # Result flag (standalone)
+    r'^\s*Normal\s*$',                # Result flag (standalone)
+    r'^\s*Abnormal\s*$',              # Result flag (standalone)
+    r'^\s*High\s+Risk\s*$',           # Risk assessment
+    r'^\s*Moderate\s+Risk\s*$',       # Risk assessment
+    r'^\s*Low\s+Risk\s*$',            # Risk assessment
+    r'insufficiency\s+as\s+a\s+level', # Partial sentence artifact
+    r'guideline\.\s*JCEM',            # Reference text artifact
+    r'between\s*$',                   # Incomplete sentence
+    r'^\s*Reference\s+Range\s*$',     # Column header
+    r'^\s*Flag\s*$',                  # Column header
+    r'^\s*Units?\s*$',                # Column header
+    r'^\s*Result\s*$',                # Column header
+    r'^\s*Test\s*$',                  # Column header
+    r'^\s*Component\s*$',             # Column header
+    r'^\s*Status\s*$',                # Column header
+]
+
+# Patterns for pagination text that gets mixed with unit names
+PAGINATION_PATTERNS = [
+    r'\s*page\s+\d+\s+of\s+\d+',      # "Page 1 of 2", "page 2 of 3"
+    r'\s*\d+\s+of\s+\d+',             # "1 of 2", "2 of 3" 
+    r'\s*p\.\s*\d+\s*/\s*\d+',        # "p. 1/2", "p.2/3"
+    r'\s*\(\s*\d+\s*/\s*\d+\s*\)',    # "(1/2)", "(2/3)"
+]
+
+# Substrings that mark a cell as a flag, header or text artifact rather than a test name
+INVALID_TEST_NAME_ARTIFACTS = [
+    'borderline high', 'high', 'low', 'normal', 'abnormal', 'very high',
+    'high risk', 'moderate risk', 'low risk', 'risk',
+    'result', 'flag', 'units', 'reference', 'interval',
+    'component', 'status', 'test', 'range',
+    'insufficiency', 'guideline', 'jcem', 'between',
+    'previous', 'current', 'date', 'collected'
+]
+
+# Test name fragments that identify each panel type, checked in order
+PANEL_TEST_PATTERNS = {
+    'cbc': ('wbc', 'rbc', 'hemoglobin', 'hematocrit', 'mcv', 'mch', 'mchc', 'rdw', 'platelets', 'neutrophils', 'lymphs', 'monocytes', 'eos', 'basos', 'platelet'),
+    'metabolic': ('glucose', 'bun', 'creatinine', 'egfr', 'sodium', 'potassium', 'chloride', 'co2', 'carbon dioxide', 'albumin', 'protein', 'bilirubin', 'alkaline', 'ast', 'alt'),
+    'lipid': ('cholesterol', 'triglycerides', 'hdl', 'ldl', 'vldl'),
+    'hepatitis': ('hbsag', 'hcv', 'hep a', 'hep b', 'hepatitis'),
+    'thyroid': ('tsh', 'thyroid'),
+    'vitamin': ('vitamin', 'b12', 'folate'),
+    'hormone': ('testosterone', 'estrogen', 'hormone'),
+    'diabetes': ('a1c', 'hemoglobin a1c'),
+}
+
+# Ordered panel name keywords for each panel type: (any of these, none of these)
+PANEL_TYPE_KEYWORDS = {
+    'cbc': (('cbc', 'blood count'), ('metabolic',)),
+    'metabolic': (('metabolic', 'cmp'), ()),
+    'lipid': (('lipid',), ()),
+    'hepatitis': (('hepatitis',), ()),
+    'thyroid': (('thyroid',), ()),
+    'vitamin': (('vitamin',), ()),
+    'hormone': (('hormone', 'testosterone'), ()),
+    'diabetes': (('a1c',), ()),
+}
+
+# Common reference ranges for LabCorp tests that often print without one: (required name keywords, range)
+# ('bun/crea' also covers 'bun/creatinine')
+REFERENCE_RANGE_OVERRIDES = (
+    (('egfr',), {'low': 90.0, 'high': None, 'text': '≥90'}),
+    (('bun/crea',), {'low': 8.0, 'high': 27.0, 'text': '8-27'}),
+    (('a/g ratio',), {'low': 1.2, 'high': 2.2, 'text': '1.2-2.2'}),
+    (('globulin', 'total'), {'low': 1.5, 'high': 4.5, 'text': '1.5-4.5'}),
+)
+
+# Known qualitative result patterns
+QUALITATIVE_RESULT_PATTERNS = [
+    'NEGATIVE', 'POSITIVE', 'NON REACTIVE', 'REACTIVE', 'INDETERMINATE',
+    'NOT DETECTED', 'DETECTED', 'BORDERLINE', 'ABNORMAL', 'NORMAL',
+    'SATISFACTORY', 'UNSATISFACTORY', 'PRESENT', 'ABSENT',
+    'HIGH', 'LOW', 'CRITICAL', 'TOXIC', 'THERAPEUTIC'
+]
+
+# Standardization mapping for qualitative results, in priority order
+QUALITATIVE_STANDARD_VARIANTS = [
+    (['NEGATIVE', 'NON REACTIVE', 'NOT DETECTED', 'ABSENT'], "Negative"),
+    (['POSITIVE', 'REACTIVE', 'DETECTED', 'PRESENT'], "Positive"),
+    (['INDETERMINATE', 'BORDERLINE', 'INCONCLUSIVE'], "Indeterminate"),
+]
+
+# Each pattern list is unioned into one regex so a line is scanned once, not once per pattern
+_INSTRUCTIONAL_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in INSTRUCTIONAL_SKIP_PATTERNS), re.IGNORECASE)
+_PAGINATION_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in PAGINATION_PATTERNS), re.IGNORECASE)
+_INVALID_ARTIFACT_RE = re.compile('|'.join(map(re.escape, INVALID_TEST_NAME_ARTIFACTS)))
+_QUALITATIVE_RESULT_RE = re.compile('|'.join(map(re.escape, QUALITATIVE_RESULT_PATTERNS)))
+_QUALITATIVE_STANDARD_FORMS = [
+    (re.compile('|'.join(map(re.escape, variants))), standard_value)
+    for variants, standard_value in QUALITATIVE_STANDARD_VARIANTS
+]
+
+
+# Header cells, units and test names repeat across rows and reports, so these pure text helpers are memoized
+@lru_cache(maxsize=4096)
+def _instructional_matches(text: str) -> bool:
+    """Return True if text matches any instructional/skip pattern."""
+    return bool(_INSTRUCTIONAL_RE.search(text))
+
+
+@lru_cache(maxsize=4096)
+def _valid_test_name(text: str) -> bool:
+    """Return True if text is neither instructional nor contains an invalid artifact."""
+    return not _instructional_matches(text) and not _INVALID_ARTIFACT_RE.search(text.lower())
+
+
+@lru_cache(maxsize=256)
+def _parse_date_iso(date_str: str) -> Optional[str]:
+    """Return the date part of date_str in ISO format (YYYY-MM-DD), or None if it can't be parsed."""
+    # M/D/YYYY is the usual lab report form; strptime handles it without dateutil's tokenizer
+    try:
+        return datetime.strptime(date_str, '%m/%d/%Y').date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return date_parser.parse(date_str).date().isoformat()
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _strip_pagination(text: str) -> str:
+    """Return text with pagination fragments removed and surrounding whitespace stripped."""
+    return _PAGINATION_RE.sub('', text).strip()
+
+
+@lru_cache(maxsize=4096)
+def _reference_range_override(test_name_lower: str) -> Optional[Dict[str, Any]]:
+    """Return the first override range whose keywords all appear in the name, or None."""
+    for keywords, reference_range in REFERENCE_RANGE_OVERRIDES:
+        if all(keyword in test_name_lower for keyword in keywords):
+            return reference_range
+    return None
+
+
 class PDFParser:
     """
     Enhanced PDF parser for extracting lab results from medical reports.
@@ -25,46 +180,6 @@ class PDFParser:
         - Robust error handling for malformed PDFs
     """
 
-    # Patterns for filtering out instructional text that shouldn't be parsed as test names or panels
-    INSTRUCTIONAL_SKIP_PATTERNS = [
-        r'Comments?:',          # Comment fields
-        r'Interpretation:',     # Interpretation fields
-        r'Please note',         # Instructional text
-        r'Note:',              # Note fields
-        r'Important:',         # Important notices
-        r'Instructions?:',     # Instruction fields
-        r'Disclaimer:',        # Disclaimer text
-        r'Warning:',           # Warning text
-        r'Request Problem',    # Request/processing error text
-        r'^\s*Borderline\s+High\s*$',     # Result flag
-        r'^\s*Very\s+High\s*$',           # Result flag
-        r'^\s*High\s*$',                  # Result flag (standalone)
-        r'^\s*Low\s*$',                   # Result flag (standalone)
-        r'^\s*Normal\s*$',                # Result flag (standalone)
-        r'^\s*Abnormal\s*$',              # Result flag (standalone)
-        r'^\s*High\s+Risk\s*$',           # Risk assessment
-        r'^\s*Moderate\s+Risk\s*$',       # Risk assessment
-        r'^\s*Low\s+Risk\s*$',            # Risk assessment
-        r'insufficiency\s+as\s+a\s+level', # Partial sentence artifact
-        r'guideline\.\s*JCEM',            # Reference text artifact
-        r'between\s*$',                   # Incomplete sentence
-        r'^\s*Reference\s+Range\s*$',     # Column header
-        r'^\s*Flag\s*$',                  # Column header
-        r'^\s*Units?\s*$',                # Column header
-        r'^\s*Result\s*$',                # Column header
-        r'^\s*Test\s*$',                  # Column header
-        r'^\s*Component\s*$',             # Column header
-        r'^\s*Status\s*$',                # Column header
-    ]
-
-    # Patterns for pagination text that gets mixed with unit names
-    PAGINATION_PATTERNS = [
-        r'\s*page\s+\d+\s+of\s+\d+',      # "Page 1 of 2", "page 2 of 3"
-        r'\s*\d+\s+of\s+\d+',             # "1 of 2", "2 of 3" 
-        r'\s*p\.\s*\d+\s*/\s*\d+',        # "p. 1/2", "p.2/3"
-        r'\s*\(\s*\d+\s*/\s*\d+\s*\)',    # "(1/2)", "(2/3)"
-    ]
-
     def _is_instructional_text(self, text: str) -> bool:
         """
         Check if text matches any instructional/skip patterns.
@@ -78,45 +193,42 @@ class PDFParser:
         if not text:
             return False
             
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in self.INSTRUCTIONAL_SKIP_PATTERNS)
+        return _instructional_matches(text)
 
     def _clean_pagination_text(self, text: str) -> str:
         """Remove pagination text patterns from extracted text."""
         if not text:
             return text
             
-        cleaned_text = text
-        for pattern in self.PAGINATION_PATTERNS:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE)
-        
-        return cleaned_text.strip()
+        return _strip_pagination(text)
     
     def _is_valid_test_name(self, test_name: str) -> bool:
         """Check if a test name is valid (not instructional text or invalid artifacts)."""
         if not test_name or len(test_name) < 3:
             return False
-        
-        if self._is_instructional_text(test_name):
-            return False
-        
-        invalid_artifacts = [
-            'borderline high', 'high', 'low', 'normal', 'abnormal', 'very high',
-            'high risk', 'moderate risk', 'low risk', 'risk',
-            'result', 'flag', 'units', 'reference', 'interval',
-            'component', 'status', 'test', 'range',
-            'insufficiency', 'guideline', 'jcem', 'between',
-            'previous', 'current', 'date', 'collected'
-        ]
-        
-        return not any(artifact in test_name.lower() for artifact in invalid_artifacts)
+
+        return _valid_test_name(test_name)
 
     def __init__(self):
         """Initialize PDF parser with regex patterns for data extraction."""
         self.numeric_pattern = re.compile(r'^[<>]?[\d.]+$')
         self.unit_pattern = re.compile(r'^[A-Za-z/%\-\(\).]+$')
         self.range_pattern = re.compile(r'-|>|<')
+        self.cell_classifier = re.compile(
+            r'(?P<numeric>[<>]?[\d.]+)$|(?P<unit>[A-Za-z/%\-\(\).]+)$|.*?(?P<range>[-<>])', re.DOTALL
+        )
         self.code_pattern = re.compile(r'([^;()]{5,})\s*\([0-9]+\)')
+        self.panel_code_pattern = re.compile(r'([^()]+)\s*\([0-9]+\)')
+        self.digit_pattern = re.compile(r'\d')
+        # Deletes < and > in one C-level translate, without entering the regex engine
+        self.comparator_table = str.maketrans('', '', '<>')
+        # Pattern: Test Name [value] [unit] [reference]
+        self.text_test_pattern = re.compile(
+            r'^([A-Za-z][A-Za-z\s,\-]+?)\s+([<>]?[\d.]+)(?:\s+([A-Za-z/%\-\(\)]+))?'
+            r'(?:\s+([<>]?[\d.<>-]+(?:\.\d+)?(?:-[<>]?[\d.]+(?:\.\d+)?)?))?$'
+        )
         self.test_result_pattern = re.compile(r'\d+\.?\d*\s*(mg/dL|mmol/L|g/dL|%|x10E\d|uIU/mL)')
+        # Date formats in priority order
         self.date_patterns = [
             re.compile(r'(\d{1,2}/\d{1,2}/\d{4})'),
             re.compile(r'(\d{4}-\d{2}-\d{2})'),
@@ -128,20 +240,62 @@ class PDFParser:
             re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+),?\s*(?:MD|M\.D\.)', re.IGNORECASE),
             re.compile(r'Dr\.?\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]*)*)', re.IGNORECASE),
         ]
+        # Strips a leading "Dr." and everything from an NPI/MD/DO/Dr token onward; MD and DO
+        # only match in capitals so surnames like "Do" and "Md" survive
+        self.physician_cleanup_pattern = re.compile(r'\s+(?:NPI|(?-i:MD|DO)|Dr\.?)\b.*$|^Dr\.?\s+', re.IGNORECASE | re.DOTALL)
+
+        # LabCorp report patterns
+        self.labcorp_date_pattern = re.compile(r'Date Collected:\s*(\d{1,2}/\d{1,2}/\d{4})', re.IGNORECASE)
+        self.labcorp_provider_pattern = re.compile(r'Ordering Physician:\s*([A-Z\s]+?)(?:\n|$)', re.IGNORECASE)
+        # Standalone panel header lines, one alternative per known form
+        self.labcorp_panel_pattern = re.compile(
+            r'^(?:Comp\. Metabolic Panel.*\(\d+\)'
+            r'|Lipid Panel'
+            r'|CBC.*Panel.*'
+            r'|[A-Za-z\s]+Panel'
+            r'|Apolipoprotein [A-Z])$',
+            re.IGNORECASE
+        )
+        # Panel headers that start a run of test lines; alternatives are tried in order
+        # at the line start, so the first listed form that matches supplies the name
+        self.labcorp_panel_header_pattern = re.compile(
+            r'^(?:(Comp\. Metabolic Panel[^:\n]*)'
+            r'|(Lipid Panel[^:\n]*)'
+            r'|([A-Za-z][A-Za-z\s\.,/()]+Panel[^:\n]*)'
+            r'|([A-Za-z][A-Za-z\s\.,/()]+\(\d+\)))',
+            re.IGNORECASE
+        )
+        # LabCorp format: TestName 01 Value [Flag] PreviousValue Date Unit ReferenceRange
+        self.labcorp_line_pattern = re.compile(
+            r'^([A-Za-z][A-Za-z\s\.,/()]+?)\s+\d{2}\s+([\d\.]+)\s*([A-Za-z]*)\s+[\d\.\*]*\s+'
+            r'\d{2}/\d{2}/\d{4}\s+([A-Za-z/\d]+)\s+([\d\.\-<>]+)'
+        )
+        self.labcorp_header_line_pattern = re.compile(r'test|current result|reference interval|units', re.IGNORECASE)
+        self.labcorp_invalid_panel_pattern = re.compile(r'high|low|mg/dl|ordered items', re.IGNORECASE)
+        self.value_hint_pattern = re.compile(r'[\d.]')
+        self.labcorp_date_hint_pattern = re.compile(r'\d{2}/\d{2}/\d{4}')
+        self.labcorp_simple_line_pattern = re.compile(r'^([A-Za-z][A-Za-z\s\.,/()]+?)\s+([\d\.]+)\s*([A-Za-z]*)\s')
 
     async def parse_pdf_content(self, content: bytes) -> Dict[str, Any]:
+        """Parse PDF content off the event loop and extract lab results using dual parsing strategy."""
+        # Parsing is CPU-bound and synchronous; a worker thread keeps other requests responsive
+        return await asyncio.to_thread(self.parse_pdf_bytes, content)
+
+    def parse_pdf_bytes(self, content: bytes) -> Dict[str, Any]:
         """Parse PDF content and extract lab results using dual parsing strategy."""
         if not content:
             raise ValueError("PDF content is empty")
 
         try:
+            # Extract the full text once; both strategies read it
+            text = self.extract_text_from_pdf(content)
+
             # Try pdfplumber first (better for tables)
-            result = self.parse_with_pdfplumber(content)
+            result = self.parse_with_pdfplumber(content, text)
             if result and result.get('tests'):
                 return result
 
             # Fallback to pypdf text extraction
-            text = self.extract_text_from_pdf(content)
             if not text or len(text.strip()) < 50:
                 raise ValueError("PDF appears to be empty or contains no readable text")
 
@@ -159,19 +313,29 @@ class PDFParser:
             print(f"Error parsing PDF: {e}")
             raise ValueError(f"PDF parsing failed: {str(e)}")
 
-    def parse_with_pdfplumber(self, content: bytes) -> Dict[str, Any]:
+    def parse_with_pdfplumber(self, content: bytes, pypdf_text: Optional[str] = None) -> Dict[str, Any]:
         """Parse PDF using pdfplumber library for structured table extraction."""
         try:
-            pypdf_text = self.extract_text_from_pdf(content)
+            if pypdf_text is None:
+                pypdf_text = self.extract_text_from_pdf(content)
             date_collected = self.extract_date_from_text(pypdf_text)
             physician = self.extract_physician_from_text(pypdf_text)
 
             with pdfplumber.open(io.BytesIO(content)) as pdf:
                 all_tests = []
 
-                ordered_panels = self.extract_ordered_panels(pdf.pages[0]) if pdf.pages else []
+                # Page one's text feeds the ordered panels and, without tables, its text tests
+                first_page_text = pdf.pages[0].extract_text() if pdf.pages else None
+                ordered_panels = self.extract_ordered_panels(first_page_text)
+
+                # Test count before each page; stop once two pages in a row add no tests after some were found
+                tests_per_page = []
 
                 for page_num, page in enumerate(pdf.pages):
+                    if page_num >= 2 and all_tests and tests_per_page[-2] == len(all_tests):
+                        break
+
+                    tests_per_page.append(len(all_tests))
                     tables = page.extract_tables()
 
                     if tables:
@@ -179,7 +343,7 @@ class PDFParser:
                             tests = self.process_table_with_ordered_panels(table, ordered_panels)
                             all_tests.extend(tests)
                     else:
-                        page_text = page.extract_text()
+                        page_text = first_page_text if page_num == 0 else page.extract_text()
                         if page_text:
                             text_tests = self.extract_tests_from_text(page_text, ordered_panels)
                             all_tests.extend(text_tests)
@@ -197,65 +361,58 @@ class PDFParser:
             print(f"pdfplumber parsing failed: {e}")
             return None
 
-    def extract_ordered_panels(self, page) -> List[str]:
-        """Extract panel names from the 'Tests Ordered' section."""
-        ordered_panels = []
+    def extract_ordered_panels(self, page_text: Optional[str]) -> List[str]:
+        """Extract panel names from the 'Tests Ordered' section of the first page's text."""
+        # One pass over the lines fills all three sources; they are combined in priority order below
+        section_panels = []
+        listed_panels = []
+        descriptive_panels = []
 
         try:
-            page_text = page.extract_text()
             if not page_text:
-                return ordered_panels
-
-            lines = page_text.split('\n')
+                return section_panels
 
             tests_ordered_section = False
-            for i, line in enumerate(lines):
-                line = line.strip()
+            section_done = False
 
-                if 'tests ordered' in line.lower() or 'test ordered' in line.lower():
-                    tests_ordered_section = True
+            for raw_line in page_text.splitlines():
+                line = raw_line.strip()
+                if not line:
                     continue
-
-                if tests_ordered_section:
-                    if any(header in line.lower() for header in ['patient', 'specimen', 'physician', 'test', 'result']):
-                        if 'test' not in line.lower() or 'result' in line.lower():
-                            break
-
-                    panels_in_line = self.extract_panels_from_ordered_line(line)
-                    ordered_panels.extend(panels_in_line)
-
-            for line in lines:
+                line_lower = line.lower()
+
+                # Panels listed under the "Tests Ordered" heading, up to the next section header
+                if not section_done:
+                    if 'tests ordered' in line_lower or 'test ordered' in line_lower:
+                        tests_ordered_section = True
+                    elif tests_ordered_section:
+                        if (('patient' in line_lower or 'specimen' in line_lower or 'physician' in line_lower or
+                             'test' in line_lower or 'result' in line_lower) and
+                                ('test' not in line_lower or 'result' in line_lower)):
+                            section_done = True
+                        else:
+                            section_panels.extend(self.extract_panels_from_ordered_line(line))
+
+                # "Panel Name (code); Panel Name (code)" lists anywhere on the page
                 if ';' in line and '(' in line and ')' in line:
-                    panels_in_line = self.extract_panels_from_ordered_line(line)
-                    ordered_panels.extend(panels_in_line)
-
-            unique_panels = []
-            for panel in ordered_panels:
-                if panel not in unique_panels:
-                    unique_panels.append(panel)
-
-            if not unique_panels:
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
+                    listed_panels.extend(self.extract_panels_from_ordered_line(line))
 
+                # Descriptive panel-like lines, used only when nothing was listed
+                if (len(line) > 10 and
+                    ('panel' in line_lower or 'cbc' in line_lower or 'count' in line_lower or
+                     'metabolic' in line_lower or 'lipid' in line_lower or 'hepatitis' in line_lower) and
+                    not self.test_result_pattern.search(line) and
                     # Skip instructional text that shouldn't be panel names
-                    if self._is_instructional_text(line):
-                        continue
-
-                    if (len(line) > 10 and
-                        not re.search(r'\d+\.?\d*\s*(mg/dL|mmol/L|g/dL|%|x10E\d|uIU/mL)', line) and
-                        ('panel' in line.lower() or 'cbc' in line.lower() or 'count' in line.lower() or
-                         'metabolic' in line.lower() or 'lipid' in line.lower() or 'hepatitis' in line.lower())):
+                    not self._is_instructional_text(line)):
+                    descriptive_panels.append(' '.join(line.split()))
 
-                        clean_line = re.sub(r'\s+', ' ', line).strip()
-                        if clean_line not in unique_panels:
-                            unique_panels.append(clean_line)
+            unique_panels = list(dict.fromkeys(section_panels + listed_panels))
+            if not unique_panels:
+                unique_panels = list(dict.fromkeys(descriptive_panels))
             return unique_panels
 
         except Exception as e:
-            return ordered_panels
+            return section_panels + listed_panels
 
     def extract_panels_from_ordered_line(self, line: str) -> List[str]:
         """Extract panel names from a single line in the Tests Ordered section."""
@@ -290,14 +447,14 @@ class PDFParser:
 
         # Pattern: Panel Name (code)
         # Extract everything before the last parentheses that contains numbers
-        match = re.match(r'([^()]+)\s*\([0-9]+\)', text)
+        match = self.panel_code_pattern.match(text)
         if match:
             panel_name = match.group(1).strip()
             if len(panel_name) > 5:  # Must be substantial text
                 return panel_name
 
         # If no parentheses with numbers, check if it's a descriptive panel name
-        if len(text) > 10 and not re.search(r'\d+', text):
+        if len(text) > 10 and not self.digit_pattern.search(text):
             # Could be a panel name without a code
             return text.strip()
 
@@ -313,8 +470,16 @@ class PDFParser:
         # Find header row and determine column structure
         header_row = None
         for i, row in enumerate(table):
-            if row and any(cell and ('test' in cell.lower() or 'result' in cell.lower() or 'reference' in cell.lower()) for cell in row if cell):
-                header_row = i
+            if not row:
+                continue
+            for cell in row:
+                if not cell:
+                    continue
+                cell_lower = cell.lower()
+                if 'test' in cell_lower or 'result' in cell_lower or 'reference' in cell_lower:
+                    header_row = i
+                    break
+            if header_row is not None:
                 break
 
         if header_row is None:
@@ -327,6 +492,10 @@ class PDFParser:
         if not self.is_test_results_table(headers):
             return tests
 
+        # Headers are fixed for the whole table, so map the columns once rather than per row
+        column_map = self._build_column_map(headers)
+        ordered_panels_lower = [panel.lower() for panel in ordered_panels]
+
         # Process data rows and match with ordered panels
         current_panel = None
 
@@ -335,12 +504,12 @@ class PDFParser:
                 continue
 
             # Check if this row is a panel header from our ordered panels
-            panel_name = self.match_row_to_ordered_panel(row, ordered_panels)
+            panel_name = self.match_row_to_ordered_panel(row, ordered_panels, ordered_panels_lower)
             if panel_name:
                 current_panel = panel_name
                 continue
 
-            test = self.process_table_row(row, headers)
+            test = self.process_table_row(row, headers, column_map)
             if test:
 
                 # Associate test with current panel
@@ -357,11 +526,15 @@ class PDFParser:
 
         return tests
 
-    def match_row_to_ordered_panel(self, row: List[str], ordered_panels: List[str]) -> Optional[str]:
+    def match_row_to_ordered_panel(self, row: List[str], ordered_panels: List[str],
+                                   ordered_panels_lower: Optional[List[str]] = None) -> Optional[str]:
         """Check if a table row matches one of the ordered panels"""
         if not row or not ordered_panels:
             return None
 
+        if ordered_panels_lower is None:
+            ordered_panels_lower = [panel.lower() for panel in ordered_panels]
+
         # Get the first non-empty cell
         first_cell = None
         for cell in row:
@@ -382,14 +555,16 @@ class PDFParser:
         if has_numeric_result:
             return None
 
+        first_cell_lower = first_cell.lower()
+
         # Try to match against ordered panels
-        for panel in ordered_panels:
+        for panel, panel_lower in zip(ordered_panels, ordered_panels_lower):
             # Exact match
-            if first_cell.lower() == panel.lower():
+            if first_cell_lower == panel_lower:
                 return panel
 
             # Partial match (panel name contains the cell text or vice versa)
-            if panel.lower() in first_cell.lower() or first_cell.lower() in panel.lower():
+            if panel_lower in first_cell_lower or first_cell_lower in panel_lower:
                 # Make sure it's a substantial match (not just a single word)
                 if len(first_cell) > 5:
                     return panel
@@ -401,67 +576,27 @@ class PDFParser:
         if not test_name or not ordered_panels:
             return None
 
-        test_name_lower = test_name.lower().replace('\n', ' ').replace('  ', ' ').strip()
-
-        # Common test patterns for different panel types
-        panel_test_patterns = {
-            'cbc': ['wbc', 'rbc', 'hemoglobin', 'hematocrit', 'mcv', 'mch', 'mchc', 'rdw', 'platelets', 'neutrophils', 'lymphs', 'monocytes', 'eos', 'basos', 'platelet'],
-            'metabolic': ['glucose', 'bun', 'creatinine', 'egfr', 'sodium', 'potassium', 'chloride', 'co2', 'carbon dioxide', 'albumin', 'protein', 'bilirubin', 'alkaline', 'ast', 'alt'],
-            'lipid': ['cholesterol', 'triglycerides', 'hdl', 'ldl', 'vldl'],
-            'hepatitis': ['hbsag', 'hcv', 'hep a', 'hep b', 'hepatitis'],
-            'thyroid': ['tsh', 'thyroid'],
-            'vitamin': ['vitamin', 'b12', 'folate'],
-            'hormone': ['testosterone', 'estrogen', 'hormone'],
-            'diabetes': ['a1c', 'hemoglobin a1c']
-        }
+        test_name_lower = ' '.join(test_name.casefold().split())
+        ordered_panels_lower = [ordered_panel.casefold() for ordered_panel in ordered_panels]
 
         # Try to match test to panel type, then find corresponding ordered panel
         best_match = None
         best_match_count = 0
 
         # Check each panel type in order of specificity (most specific first)
-        for panel_type, test_patterns in panel_test_patterns.items():
+        for panel_type, test_patterns in PANEL_TEST_PATTERNS.items():
             # Check if the test name matches any pattern in this panel type
             matches = sum(1 for pattern in test_patterns if pattern in test_name_lower)
 
-            if matches > 0:
+            if matches > best_match_count:
                 # Find the ordered panel that matches this type
-                for ordered_panel in ordered_panels:
-                    ordered_panel_lower = ordered_panel.lower()
-
-                    # More specific matching logic - check most specific patterns first
-                    type_match = False
-
-                    if panel_type == 'metabolic':
-                        # Metabolic panels: must contain "metabolic" OR be a CMP
-                        if 'metabolic' in ordered_panel_lower or 'cmp' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'cbc':
-                        # CBC panels: must contain "cbc" OR "blood count" but NOT metabolic
-                        if ('cbc' in ordered_panel_lower or 'blood count' in ordered_panel_lower) and 'metabolic' not in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'lipid':
-                        if 'lipid' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'hepatitis':
-                        if 'hepatitis' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'thyroid':
-                        if 'thyroid' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'vitamin':
-                        if 'vitamin' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'hormone':
-                        if 'hormone' in ordered_panel_lower or 'testosterone' in ordered_panel_lower:
-                            type_match = True
-                    elif panel_type == 'diabetes':
-                        if 'a1c' in ordered_panel_lower:
-                            type_match = True
-
-                    if type_match and matches > best_match_count:
+                keywords, excluded = PANEL_TYPE_KEYWORDS[panel_type]
+                for ordered_panel, ordered_panel_lower in zip(ordered_panels, ordered_panels_lower):
+                    if (any(keyword in ordered_panel_lower for keyword in keywords) and
+                        not any(keyword in ordered_panel_lower for keyword in excluded)):
                         best_match = ordered_panel
                         best_match_count = matches
+                        break
 
         return best_match
 
@@ -471,29 +606,26 @@ class PDFParser:
         if not headers:
             return False
 
-        normalized_headers = [header.strip().upper() if header else '' for header in headers]
+        # One joined string serves every keyword check; the separator keeps matches within a header
+        joined_headers = ' '.join(header.strip().upper() for header in headers if header)
 
         # Check if we have the basic test results structure
-        has_test_column = any('TEST' in header for header in normalized_headers)
-        has_result_column = any('RESULT' in header for header in normalized_headers)
-
-        if not (has_test_column and has_result_column):
+        if 'TEST' not in joined_headers or 'RESULT' not in joined_headers:
             return False
 
         # Additional check: make sure it's not a patient info or specimen table
-        patient_info_indicators = ['SPECIMEN', 'PATIENT', 'ACCOUNT', 'CONTROL']
-        is_patient_info = any(indicator in ' '.join(normalized_headers) for indicator in patient_info_indicators)
-
-        if is_patient_info:
+        if ('SPECIMEN' in joined_headers or 'PATIENT' in joined_headers or
+                'ACCOUNT' in joined_headers or 'CONTROL' in joined_headers):
             return False
 
         # Check for "Tests Ordered" table (not actual results)
-        if len(normalized_headers) == 1 and 'TESTS ORDERED' in normalized_headers[0]:
+        if len(headers) == 1 and 'TESTS ORDERED' in joined_headers:
             return False
 
         return True
 
-    def process_table_row(self, row: List[str], headers: List[str]) -> Optional[Dict[str, Any]]:
+    def process_table_row(self, row: List[str], headers: List[str],
+                          column_map: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
         """Process a single table row using column headers to properly map data"""
         if not row:
             return None
@@ -512,19 +644,19 @@ class PDFParser:
 
         # Map columns based on headers if available
         if headers and len(headers) > 0:
-            return self.process_row_with_headers(cleaned_row, headers)
+            if column_map is None:
+                column_map = self._build_column_map(headers)
+            return self.process_row_with_headers(cleaned_row, column_map)
         else:
             # Fallback to heuristic method if no headers
             return self.process_row_heuristic(cleaned_row)
 
-    def process_row_with_headers(self, row: List[str], headers: List[str]) -> Optional[Dict[str, Any]]:
-        """Process row using column headers to identify data"""
+    def _build_column_map(self, headers: List[str]) -> Dict[str, int]:
+        """Map test/result/unit/reference fields to their column indexes from table headers"""
         # Normalize headers for comparison
         normalized_headers = [header.strip().upper() if header else '' for header in headers]
 
-        # Create column mapping
         column_map = {}
-        ignored_columns = []
         for i, header in enumerate(normalized_headers):
             if 'TEST' in header:
                 column_map['test'] = i
@@ -534,11 +666,12 @@ class PDFParser:
                 column_map['unit'] = i
             elif 'REFERENCE' in header or 'INTERVAL' in header:
                 column_map['reference'] = i
-            # Explicitly ignore FLAG and LAB columns
-            elif 'FLAG' in header or 'LAB' in header:
-                ignored_columns.append(i)
-                continue  # Skip these columns entirely
+            # FLAG and LAB columns are left unmapped and ignored entirely
 
+        return column_map
+
+    def process_row_with_headers(self, row: List[str], column_map: Dict[str, int]) -> Optional[Dict[str, Any]]:
+        """Process row using a column map built from the table headers to identify data"""
 
         # Extract values based on column mapping
         test_name = None
@@ -624,9 +757,17 @@ class PDFParser:
 
         # Simple heuristic: first non-empty cell is usually test name
         for i, cell in enumerate(row):
-            if cell and not test_name:
+            if not cell:
+                continue
+
+            # Classify the cell in one regex pass; overlapping kinds are rechecked only when reached
+            match = self.cell_classifier.match(cell)
+            kind = match.lastgroup if match else None
+            is_numeric = kind == 'numeric'
+
+            if not test_name:
                 # Check if this looks like a test name (not a number)
-                if not self.numeric_pattern.match(cell):
+                if not is_numeric:
                     # Clean up multi-line lab names by joining lines and removing extra whitespace
                     test_name = ' '.join(cell.split())
                     test_name = self._clean_pagination_text(test_name)
@@ -638,19 +779,19 @@ class PDFParser:
                     continue
 
             # Look for numeric result
-            if cell and not result and self.numeric_pattern.match(cell):
+            if not result and is_numeric:
                 result = cell
                 continue
 
             # Look for unit (letters, not numbers)
-            if cell and not unit and self.unit_pattern.match(cell):
+            if not unit and (kind == 'unit' or (is_numeric and self.unit_pattern.match(cell))):
                 unit = cell
                 # Clean pagination text that may have been mixed with the unit
                 unit = self._clean_pagination_text(unit)
                 continue
 
             # Look for reference range
-            if cell and not reference_range and self.range_pattern.search(cell):
+            if not reference_range and (kind == 'range' or (kind is not None and self.range_pattern.search(cell))):
                 reference_range = cell
                 continue
 
@@ -696,7 +837,8 @@ class PDFParser:
             # Clean pagination text that may have been mixed with the unit
             cleaned_unit = self._clean_pagination_text(current_unit)
             if cleaned_unit:
-                return cleaned_unit
+                # The same few unit strings repeat on every row; share one copy of each
+                return sys.intern(cleaned_unit)
         
         # Apply known unit mappings for common tests that might not have units in the PDF
         test_name_lower = test_name.lower()
@@ -718,34 +860,11 @@ class PDFParser:
         if current_range and current_range.get('text'):
             return current_range
         
-        test_name_lower = test_name.lower()
-        
-        # Common reference ranges for LabCorp tests
-        if 'egfr' in test_name_lower:
-            return {
-                'low': 90.0,
-                'high': None,
-                'text': '≥90'
-            }
-        elif 'bun/creatinine' in test_name_lower or 'bun/crea' in test_name_lower:
-            return {
-                'low': 8.0,
-                'high': 27.0,
-                'text': '8-27'
-            }
-        elif 'a/g ratio' in test_name_lower:
-            return {
-                'low': 1.2,
-                'high': 2.2,
-                'text': '1.2-2.2'
-            }
-        elif 'globulin' in test_name_lower and 'total' in test_name_lower:
-            return {
-                'low': 1.5,
-                'high': 4.5,
-                'text': '1.5-4.5'
-            }
-        
+        reference_range = _reference_range_override(test_name.lower())
+        if reference_range is not None:
+            # Copy so callers can't alter the override table
+            return dict(reference_range)
+
         return current_range or {
             'low': None,
             'high': None,
@@ -764,7 +883,7 @@ class PDFParser:
 
             # Look for lines that look like test results
             # Pattern: Test Name [value] [unit] [reference]
-            match = re.match(r'^([A-Za-z][A-Za-z\s,\-]+?)\s+([<>]?[\d.]+)(?:\s+([A-Za-z/%\-\(\)]+))?(?:\s+([<>]?[\d.<>-]+(?:\.\d+)?(?:-[<>]?[\d.]+(?:\.\d+)?)?))?$', line)
+            match = self.text_test_pattern.match(line)
 
             if match:
                 name = match.group(1).strip()
@@ -776,7 +895,7 @@ class PDFParser:
                 unit = self._clean_pagination_text(unit)
                 ref_range_text = match.group(4).strip() if match.group(4) else ''
 
-                if not self._is_valid_test_name(name) or re.match(r'^[\d.]+$', name):
+                if not self._is_valid_test_name(name) or name.replace('.', '').isdecimal():
                     continue
 
                 numeric_value = self.parse_numeric_result(result)
@@ -804,18 +923,13 @@ class PDFParser:
     def extract_date_from_text(self, text: str) -> Optional[str]:
         """Extract collection date from text."""
 
-        # Look for "Date/Time Collected" section and extract just the date part
+        # Search each format separately so one format's match cannot swallow another's
         for pattern in self.date_patterns:
-            match = pattern.search(text, re.IGNORECASE | re.DOTALL)
+            match = pattern.search(text)
             if match:
-                try:
-                    date_str = match.group(1)
-                    parsed_date = date_parser.parse(date_str)
-                    # Return just the date part in ISO format (YYYY-MM-DD)
-                    result = parsed_date.date().isoformat()
-                    return result
-                except Exception as e:
-                    continue
+                parsed_date = _parse_date_iso(match.group(1))
+                if parsed_date:
+                    return parsed_date
         return None
 
     def extract_physician_from_text(self, text: str) -> Optional[str]:
@@ -823,14 +937,10 @@ class PDFParser:
 
         # Look for "Physician Name" section and extract the name from the line below
         for pattern in self.physician_patterns:
-            match = pattern.search(text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
-                physician = match.group(1).strip()                # Clean up common suffixes and prefixes
-                physician = re.sub(r'\s+NPI.*$', '', physician, re.IGNORECASE)
-                physician = re.sub(r'\s+MD.*$', '', physician, re.IGNORECASE)
-                physician = re.sub(r'\s+DO.*$', '', physician, re.IGNORECASE)
-                physician = re.sub(r'\s+Dr\.?\s*', '', physician, re.IGNORECASE)
-                physician = re.sub(r'^Dr\.?\s+', '', physician, re.IGNORECASE)
+                # Clean up common suffixes and prefixes
+                physician = self.physician_cleanup_pattern.sub('', match.group(1).strip())
 
                 # Skip if it looks like a title, header text, or empty
                 skip_values = ['physician', 'provider', 'doctor', 'npi #', 'physician id', 'npi # physician id']
@@ -851,8 +961,8 @@ class PDFParser:
             parts = text.split('-')
             if len(parts) == 2:
                 try:
-                    low = float(parts[0].strip())
-                    high = float(parts[1].strip())
+                    low = float(parts[0])
+                    high = float(parts[1])
                     return {'low': low, 'high': high, 'text': text}
                 except ValueError:
                     pass
@@ -860,7 +970,7 @@ class PDFParser:
         elif text.startswith('<'):
             # Format: "<5.0"
             try:
-                value = float(text[1:].strip())
+                value = float(text[1:])
                 return {'low': None, 'high': value, 'text': text}
             except ValueError:
                 pass
@@ -868,7 +978,7 @@ class PDFParser:
         elif text.startswith('>'):
             # Format: ">10.0"
             try:
-                value = float(text[1:].strip())
+                value = float(text[1:])
                 return {'low': value, 'high': None, 'text': text}
             except ValueError:
                 pass
@@ -881,10 +991,8 @@ class PDFParser:
             return None
 
         # Remove < and > symbols for numeric parsing
-        numeric_part = re.sub(r'[<>]', '', result)
-
         try:
-            return float(numeric_part)
+            return float(result.translate(self.comparator_table))
         except ValueError:
             return None
 
@@ -893,17 +1001,7 @@ class PDFParser:
         if not result:
             return False
 
-        result_clean = result.strip().upper()
-
-        # Known qualitative result patterns
-        qualitative_patterns = [
-            'NEGATIVE', 'POSITIVE', 'NON REACTIVE', 'REACTIVE', 'INDETERMINATE',
-            'NOT DETECTED', 'DETECTED', 'BORDERLINE', 'ABNORMAL', 'NORMAL',
-            'SATISFACTORY', 'UNSATISFACTORY', 'PRESENT', 'ABSENT',
-            'HIGH', 'LOW', 'CRITICAL', 'TOXIC', 'THERAPEUTIC'
-        ]
-
-        return any(pattern in result_clean for pattern in qualitative_patterns)
+        return bool(_QUALITATIVE_RESULT_RE.search(result.strip().upper()))
 
     def standardize_qualitative_result(self, result: str) -> str:
         """Standardize qualitative results to consistent values"""
@@ -912,22 +1010,10 @@ class PDFParser:
 
         result_clean = result.strip().upper()
 
-        # Standardization mapping
-        negative_variants = ['NEGATIVE', 'NON REACTIVE', 'NOT DETECTED', 'ABSENT']
-        positive_variants = ['POSITIVE', 'REACTIVE', 'DETECTED', 'PRESENT']
-        indeterminate_variants = ['INDETERMINATE', 'BORDERLINE', 'INCONCLUSIVE']
-
-        for variant in negative_variants:
-            if variant in result_clean:
-                return "Negative"
-
-        for variant in positive_variants:
-            if variant in result_clean:
-                return "Positive"
-
-        for variant in indeterminate_variants:
-            if variant in result_clean:
-                return "Indeterminate"
+        # Checked in priority order, so "NOT DETECTED" is Negative rather than Positive
+        for variants_re, standard_value in _QUALITATIVE_STANDARD_FORMS:
+            if variants_re.search(result_clean):
+                return standard_value
 
         # Return original if no standardization applies
         return result.strip()
@@ -937,10 +1023,7 @@ class PDFParser:
         """Extract text from PDF using pypdf as fallback."""
         try:
             pdf_reader = pypdf.PdfReader(io.BytesIO(content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            return "".join((page.extract_text() or "") + "\n" for page in pdf_reader.pages)
         except Exception as e:
             print(f"Error extracting text from PDF: {e}")
             return ""
@@ -976,9 +1059,10 @@ class PDFParser:
         # Extract provider specifically for LabCorp format
         provider_name = self.extract_labcorp_provider(text)
         
-        # Extract tests and panels from LabCorp format
-        tests = self.extract_labcorp_tests(text)
-        panels = self.extract_labcorp_panels(text)
+        # Extract tests and panels from LabCorp format, splitting the text into lines once for both
+        lines = text.splitlines()
+        tests = self.extract_labcorp_tests(lines)
+        panels = self.extract_labcorp_panels(lines)
         
         return {
             'date_collected': collection_date,
@@ -991,23 +1075,16 @@ class PDFParser:
     def extract_labcorp_collection_date(self, text: str) -> Optional[str]:
         """Extract collection date from LabCorp report."""
         # Look for "Date Collected: MM/DD/YYYY" pattern
-        date_pattern = r'Date Collected:\s*(\d{1,2}/\d{1,2}/\d{4})'
-        match = re.search(date_pattern, text, re.IGNORECASE)
+        match = self.labcorp_date_pattern.search(text)
         if match:
-            try:
-                date_str = match.group(1)
-                parsed_date = date_parser.parse(date_str)
-                return parsed_date.strftime('%Y-%m-%d')
-            except Exception as e:
-                pass
+            return _parse_date_iso(match.group(1))
         
         return None
     
     def extract_labcorp_provider(self, text: str) -> Optional[str]:
         """Extract provider name from LabCorp report."""
         # Look for "Ordering Physician: PROVIDER NAME" pattern
-        provider_pattern = r'Ordering Physician:\s*([A-Z\s]+?)(?:\n|$)'
-        match = re.search(provider_pattern, text, re.IGNORECASE)
+        match = self.labcorp_provider_pattern.search(text)
         if match:
             provider_name = match.group(1).strip()
             # Clean up the provider name
@@ -1016,13 +1093,12 @@ class PDFParser:
         
         return None
     
-    def extract_labcorp_panels(self, text: str) -> List[Dict[str, Any]]:
-        """Extract panel information from LabCorp report."""
+    def extract_labcorp_panels(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """Extract panel information from the lines of a LabCorp report."""
         panels = []
         panel_names = set()
         
         # Look for clean panel headers that appear as standalone lines
-        lines = text.split('\n')
         for line in lines:
             line = line.strip()
             if not line or len(line) < 5:
@@ -1033,26 +1109,16 @@ class PDFParser:
                 continue
             
             # Look for panel headers that are standalone lines
-            # Common LabCorp panel patterns
-            if re.match(r'^(Comp\. Metabolic Panel.*\(\d+\))$', line, re.IGNORECASE):
-                panel_name = line.strip()
-            elif re.match(r'^(Lipid Panel)$', line, re.IGNORECASE):
-                panel_name = line.strip()
-            elif re.match(r'^(CBC.*Panel.*)$', line, re.IGNORECASE):
-                panel_name = line.strip()
-            elif re.match(r'^([A-Za-z\s]+Panel)$', line, re.IGNORECASE) and 'panel' in line.lower():
-                panel_name = line.strip()
-            elif re.match(r'^(Apolipoprotein [A-Z])$', line, re.IGNORECASE):
-                panel_name = line.strip()
-            else:
+            if not self.labcorp_panel_pattern.match(line):
                 continue
+            panel_name = line
             
             # Clean up the panel name
-            panel_name = re.sub(r'\s+', ' ', panel_name)
+            panel_name = ' '.join(panel_name.split())
             
             # Skip panels that contain problematic content
             if (panel_name and panel_name not in panel_names and len(panel_name) > 3 and
-                not any(invalid in panel_name.lower() for invalid in ['high', 'low', 'mg/dl', 'ordered items'])):
+                not self.labcorp_invalid_panel_pattern.search(panel_name)):
                 panel_names.add(panel_name)
                 panels.append({
                     'name': panel_name,
@@ -1060,39 +1126,24 @@ class PDFParser:
                 })
         return panels
     
-    def extract_labcorp_tests(self, text: str) -> List[Dict[str, Any]]:
-        """Extract test results from LabCorp report."""
+    def extract_labcorp_tests(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """Extract test results from the lines of a LabCorp report."""
         tests = []
-        lines = text.split('\n')
         current_panel = None
         
-        # Define patterns to identify panel headers and test results
-        panel_header_patterns = [
-            r'^(Comp\. Metabolic Panel[^:\n]*)',
-            r'^(Lipid Panel[^:\n]*)',
-            r'^([A-Za-z][A-Za-z\s\.,/()]+Panel[^:\n]*)',
-            r'^([A-Za-z][A-Za-z\s\.,/()]+\(\d+\))'
-        ]
-        
-        for i, line in enumerate(lines):
+        for line in lines:
             line = line.strip()
             if not line:
                 continue
             
             # Check if this line is a panel header
-            is_panel_header = False
-            for pattern in panel_header_patterns:
-                if re.match(pattern, line, re.IGNORECASE):
-                    current_panel = re.match(pattern, line, re.IGNORECASE).group(1).strip()
-                    current_panel = re.sub(r'\s+', ' ', current_panel)
-                    is_panel_header = True
-                    break
-            
-            if is_panel_header:
+            header_match = self.labcorp_panel_header_pattern.match(line)
+            if header_match:
+                current_panel = ' '.join(header_match.group(header_match.lastindex).split())
                 continue
             
-            # Skip header lines
-            if any(header in line.lower() for header in ['test', 'current result', 'reference interval', 'units']):
+            # Skip header lines, and narrative lines with no value for either test pattern to capture
+            if self.labcorp_header_line_pattern.search(line) or not self.value_hint_pattern.search(line):
                 continue
                 
             # Try to parse as a test result line
@@ -1114,10 +1165,8 @@ class PDFParser:
         # LabCorp format: TestName 01 Value [Flag] PreviousValue Date Unit ReferenceRange
         # Example: "Glucose 01 87 90* 08/19/2022 mg/dL 70-99"
         
-        # Pattern to match LabCorp test result lines
-        labcorp_pattern = r'^([A-Za-z][A-Za-z\s\.,/()]+?)\s+\d{2}\s+([\d\.]+)\s*([A-Za-z]*)\s+[\d\.\*]*\s+\d{2}/\d{2}/\d{4}\s+([A-Za-z/\d]+)\s+([\d\.\-<>]+)'
-        
-        match = re.match(labcorp_pattern, line)
+        # Full-format lines always carry a previous-result date; skip the backtracking match without one
+        match = self.labcorp_line_pattern.match(line) if self.labcorp_date_hint_pattern.search(line) else None
         if match:
             test_name = match.group(1).strip()
             result_value = match.group(2)
@@ -1159,8 +1208,7 @@ class PDFParser:
             }
         
         # Try a simpler pattern for lines that don't match the full format
-        simple_pattern = r'^([A-Za-z][A-Za-z\s\.,/()]+?)\s+([\d\.]+)\s*([A-Za-z]*)\s'
-        match = re.match(simple_pattern, line)
+        match = self.labcorp_simple_line_pattern.match(line)
         if match:
             test_name = match.group(1).strip()
             result_value = match.group(2)
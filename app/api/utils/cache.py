@@ -1,25 +1,116 @@
 """Simple cache invalidation utilities."""
 
-from typing import Dict, Any
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
 
 
 class SimpleCache:
-    """Simple cache for pattern-based invalidation."""
+    """Bounded LRU cache with prefix- and tag-based invalidation."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # Least recently used entries first; get and set move a key to the end
+        self.cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.expires: Dict[str, float] = {}
+        # Keys kept sorted so a prefix's keys form one contiguous run
+        self.sorted_keys: List[str] = []
+        self.tags: Dict[str, Set[str]] = {}
+        self.key_tags: Dict[str, Tuple[str, ...]] = {}
+        # Sync handlers share the cache across threadpool threads
+        self.lock = threading.Lock()
+
+    def _untag(self, key: str) -> None:
+        """Remove key from the tag sets it belongs to."""
+        for tag in self.key_tags.pop(key, ()):
+            tagged = self.tags.get(tag)
+            if tagged is not None:
+                tagged.discard(key)
+                if not tagged:
+                    del self.tags[tag]
+
+    def _delete(self, key: str) -> None:
+        """Remove key from the cache and its indexes."""
+        self.cache.pop(key, None)
+        self.expires.pop(key, None)
+        self._untag(key)
+        index = bisect_left(self.sorted_keys, key)
+        if index < len(self.sorted_keys) and self.sorted_keys[index] == key:
+            del self.sorted_keys[index]
 
-    def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached entry, or None if missing or expired."""
+        with self.lock:
+            expires_at = self.expires.get(key)
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._delete(key)
+                return None
+            value = self.cache.get(key)
+            if value is not None:
+                self.cache.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None,
+            tags: Iterable[str] = ()) -> None:
+        """Store an entry under key, optionally expiring after ttl seconds and labelled with tags."""
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self._untag(key)
+            else:
+                insort(self.sorted_keys, key)
+            self.cache[key] = value
+            if ttl is None:
+                self.expires.pop(key, None)
+            else:
+                self.expires[key] = time.monotonic() + ttl
+
+            tags = tuple(tags)
+            if tags:
+                self.key_tags[key] = tags
+                for tag in tags:
+                    self.tags.setdefault(tag, set()).add(key)
+
+            # Evict least recently used entries beyond the bound
+            while len(self.cache) > self.max_entries:
+                self._delete(next(iter(self.cache)))
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        self.cache.clear()
+        with self.lock:
+            self.cache.clear()
+            self.expires.clear()
+            self.sorted_keys.clear()
+            self.tags.clear()
+            self.key_tags.clear()
+
+    def invalidate_tag(self, tag: str) -> int:
+        """Invalidate all cache keys stored with tag."""
+        with self.lock:
+            keys_to_delete = self.tags.pop(tag, set())
+            for key in keys_to_delete:
+                self._delete(key)
+            return len(keys_to_delete)
 
     def invalidate_pattern(self, pattern: str) -> int:
         """Invalidate all cache keys matching a pattern (uses startswith)."""
-        keys_to_delete = [key for key in self.cache.keys() if key.startswith(pattern)]
-        for key in keys_to_delete:
-            del self.cache[key]
-        return len(keys_to_delete)
+        with self.lock:
+            # Binary search to the first key >= pattern; the matching keys follow it contiguously
+            start = end = bisect_left(self.sorted_keys, pattern)
+            while end < len(self.sorted_keys) and self.sorted_keys[end].startswith(pattern):
+                end += 1
+            keys_to_delete = self.sorted_keys[start:end]
+            del self.sorted_keys[start:end]
+            for key in keys_to_delete:
+                del self.cache[key]
+                self.expires.pop(key, None)
+                self._untag(key)
+            return len(keys_to_delete)
 
 
 # Global cache instance
-api_cache = SimpleCache()
\ No newline at end of file
+api_cache = SimpleCache()
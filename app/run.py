@@ -20,13 +20,17 @@ def main():
 
     # Docker environments disable reload to avoid file watcher issues
     reload = os.getenv("DOCKER_ENV") != "true"
+
+    # Per-request access logs are off in Docker unless ACCESS_LOG=true
+    access_log = os.getenv("ACCESS_LOG", "false" if os.getenv("DOCKER_ENV") == "true" else "true") == "true"
     
     uvicorn.run(
         "api.main:app",
         host=host,
         port=port,
         reload=reload,
-        log_level="info"
+        log_level="info",
+        access_log=access_log
     )
 
 if __name__ == "__main__":
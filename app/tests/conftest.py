@@ -0,0 +1,40 @@
+"""Shared fixtures: a throwaway SQLite database and a test client for the API."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Point the app at a scratch database before any api module creates the engine
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from api.database import SessionLocal, engine  # noqa: E402
+from api.main import app  # noqa: E402
+from api.models import Base, Patient  # noqa: E402
+from api.utils.cache import api_cache  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Fresh schema with the default patient, dropped again after the test."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    session.add(Patient(id=1, name="Default Patient"))
+    session.commit()
+    api_cache.clear()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def client(db):
+    """Test client without startup events; the db fixture has already built the schema."""
+    return TestClient(app)
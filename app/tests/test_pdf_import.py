@@ -0,0 +1,24 @@
+"""Tests for the PDF import routes."""
+
+from api.models import PDFImportLog
+from api.routers import pdf_import
+
+
+def test_get_pdf_file_falls_back_to_uploads_dir_for_stale_recorded_path(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_import, "UPLOADS_DIR", tmp_path)
+    (tmp_path / "report.pdf").write_bytes(b"%PDF-1.4 test")
+    db.add(PDFImportLog(filename="report.pdf", file_path="data/uploads/pdfs/moved/report.pdf"))
+    db.commit()
+
+    response = client.get("/api/pdf/file/report.pdf")
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.4 test"
+
+
+def test_get_pdf_file_missing_everywhere_is_404(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_import, "UPLOADS_DIR", tmp_path)
+    db.add(PDFImportLog(filename="gone.pdf", file_path="data/uploads/pdfs/moved/gone.pdf"))
+    db.commit()
+
+    assert client.get("/api/pdf/file/gone.pdf").status_code == 404
@@ -0,0 +1,33 @@
+"""Tests for the PDF report parser."""
+
+from api.services.pdf_parser import PDFParser
+
+
+def test_extract_date_skips_invalid_preferred_candidate():
+    text = "Collected 13/45/2024\nReported 2024-03-05"
+
+    assert PDFParser().extract_date_from_text(text) == "2024-03-05"
+
+
+def test_extract_date_prefers_month_day_year():
+    text = "Reported 2024-03-05\nCollected 03/01/2024"
+
+    assert PDFParser().extract_date_from_text(text) == "2024-03-01"
+
+
+def test_extract_date_word_number_prefix_does_not_hide_iso_date():
+    text = "Specimen 1 2024-03-05"
+
+    assert PDFParser().extract_date_from_text(text) == "2024-03-05"
+
+
+def test_extract_physician_keeps_surnames_that_look_like_credentials():
+    parser = PDFParser()
+
+    assert parser.extract_physician_from_text("Physician: Anh Do") == "Anh Do"
+    assert parser.extract_physician_from_text("Physician: John Smith Md") == "John Smith Md"
+    assert parser.extract_physician_from_text("Physician: Jane Doe, MD") == "Jane Doe"
+
+
+def test_extract_physician_strips_credentials():
+    assert PDFParser().extract_physician_from_text("Physician: JOHN SMITH MD") == "JOHN SMITH"
@@ -0,0 +1,43 @@
+"""Tests for the lab results routes."""
+
+from datetime import datetime
+
+from api.models import Lab, LabResult, Panel, Provider
+from api.schemas import PaginatedLabResults
+
+
+def test_list_rows_carry_reference_status(client, db):
+    db.add_all([Panel(id=1, name="Lipid Panel"), Provider(id=1, name="Dr. Smith")])
+    db.add_all([
+        Lab(id=1, name="LDL", panel_id=1, ref_type="less", ref_value=100.0),
+        Lab(id=2, name="HDL", panel_id=1, ref_type="range", ref_low=40.0, ref_high=60.0),
+    ])
+    db.add_all([
+        LabResult(id=1, lab_id=1, patient_id=1, provider_id=1, result=130.0, date_collected=datetime(2024, 1, 2)),
+        LabResult(id=2, lab_id=2, patient_id=1, provider_id=1, result=50.0, date_collected=datetime(2024, 1, 1)),
+    ])
+    db.commit()
+
+    rows = client.get("/api/results/").json()["results"]
+
+    assert [(row["lab_name"], row["status"], row["is_normal"]) for row in rows] == [
+        ("LDL", "high", False),
+        ("HDL", "normal", True),
+    ]
+
+
+def test_list_page_flags_match_the_response_model(client, db):
+    db.add_all([Panel(id=1, name="Lipid Panel"), Provider(id=1, name="Dr. Smith")])
+    db.add(Lab(id=1, name="LDL", panel_id=1))
+    db.add_all([
+        LabResult(id=result_id, lab_id=1, patient_id=1, provider_id=1, result=90.0,
+                  date_collected=datetime(2024, 1, result_id))
+        for result_id in (1, 2, 3)
+    ])
+    db.commit()
+
+    body = client.get("/api/results/", params={"skip": 1, "limit": 2}).json()
+
+    assert (body["has_next"], body["has_prev"], body["total_pages"]) == (False, True, 2)
+    model = PaginatedLabResults.model_validate(body)
+    assert (model.has_next, model.has_prev, model.total_pages) == (body["has_next"], body["has_prev"], body["total_pages"])
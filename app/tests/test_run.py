@@ -0,0 +1,27 @@
+"""Tests for the startup script's uvicorn options."""
+
+import pytest
+
+import run
+
+
+@pytest.mark.parametrize("docker_env, access_log_env, expected", [
+    (None, None, True),
+    ("true", None, False),
+    ("true", "true", True),
+    (None, "false", False),
+])
+def test_access_log_gating(monkeypatch, docker_env, access_log_env, expected):
+    for name, value in (("DOCKER_ENV", docker_env), ("ACCESS_LOG", access_log_env)):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+    calls = []
+    monkeypatch.setattr(run.uvicorn, "run", lambda app, **options: calls.append(options))
+
+    run.main()
+
+    assert calls[0]["access_log"] is expected
+    # uvicorn keeps its own logging config, so the reloader process still logs
+    assert "log_config" not in calls[0]
@@ -0,0 +1,75 @@
+"""Tests for the settings routes: data counts and data import."""
+
+from datetime import datetime
+
+import orjson
+
+from api.models import Lab, LabResult, Panel, Provider, Unit
+
+
+def _export(**sections):
+    data = {
+        "export_info": {"version": "1.0"},
+        "patients": [], "providers": [], "panels": [], "units": [], "labs": [], "lab_results": [],
+    }
+    data.update(sections)
+    return data
+
+
+def _import(client, export_data, **form):
+    return client.post(
+        "/api/settings/import",
+        files={"import_file": ("export.json", orjson.dumps(export_data), "application/json")},
+        data=form,
+    )
+
+
+def test_merge_import_maps_existing_names(client, db):
+    db.add_all([Panel(id=1, name="Lipid Panel"), Unit(id=1, name="mg/dL"), Provider(id=1, name="Dr. Smith")])
+    db.commit()
+
+    response = _import(client, _export(
+        patients=[{"id": 7, "name": "Default Patient"}],
+        providers=[{"id": 3, "name": "Dr. Smith"}],
+        panels=[{"id": 5, "name": "Lipid Panel"}, {"id": 6, "name": "CBC"}],
+        units=[{"id": 9, "name": "mg/dL"}],
+        labs=[{"id": 11, "name": "LDL", "panel_id": 5, "unit_id": 9, "ref_high": 100.0, "ref_type": "range"}],
+        lab_results=[{"patient_id": 7, "lab_id": 11, "provider_id": 3, "result": 90.0,
+                      "date_collected": "2024-01-02T00:00:00"}],
+    ))
+
+    assert response.status_code == 200, response.text
+    assert response.json()["conflicts_resolved"] == 4
+    db.expire_all()
+    assert db.query(Panel).count() == 2
+    assert db.query(Unit).count() == 1
+    lab = db.query(Lab).one()
+    assert (lab.panel_id, lab.unit_id) == (1, 1)
+    assert db.query(LabResult).one().provider_id == 1
+
+
+def test_data_counts_reflect_deletes(client, db):
+    db.add_all([Panel(id=1, name="Lipid Panel"), Provider(id=1, name="Dr. Smith")])
+    db.add(Lab(id=1, name="LDL", panel_id=1))
+    db.add_all([
+        LabResult(id=result_id, lab_id=1, patient_id=1, provider_id=1, result=90.0,
+                  date_collected=datetime(2024, 1, result_id))
+        for result_id in (1, 2)
+    ])
+    db.commit()
+
+    assert client.get("/api/settings/data-counts").json()["data"]["lab_results"] == 2
+    assert client.delete("/api/results/1").status_code == 200
+    assert client.get("/api/settings/data-counts").json()["data"]["lab_results"] == 1
+
+
+def test_merge_import_matches_names_like_the_conflict_preview(client, db):
+    db.add(Provider(id=1, name="john smith"))
+    db.commit()
+
+    response = _import(client, _export(providers=[{"id": 3, "name": "John Smith"}]))
+
+    assert response.status_code == 200, response.text
+    assert response.json()["conflicts_resolved"] == 1
+    db.expire_all()
+    assert [provider.name for provider in db.query(Provider)] == ["john smith"]